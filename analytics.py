@@ -0,0 +1,242 @@
+"""İlerleme analizi: hareket başına tahmini 1RM ve PR'lar, bölge başına haftalık hacim,
+kardiyo temposu ve antrenman serileri.
+
+workouts tek sorguyla kolon kolon çekilir, her şey NumPy dizileri üzerinde gruplanarak
+hesaplanır (satır başına Python döngüsü yok). Sonuç veri sürümü ve gün başına bir kez
+hesaplanıp saklanır; seri ve haftalar güne bağlı olduğu için gün de anahtarda.
+"""
+from datetime import date
+
+import numpy as np
+
+import cache
+
+CARDIO = 'Kardiyo'
+WEEKS = 26            # haftalık hacim grafiğinin genişliği
+RECENT_PRS = 10
+MAX_REPS = 12         # üstündeki setlerde 1RM tahmini anlamsızlaşır; hacme yine sayılır
+EPSILON = 1e-9
+
+_memo = cache.LRUCache(4)
+
+# Temizlik (geçersiz tarih, boş isim, '' sayılar) SQL'de satır satır değil, çekildikten sonra dizilerde yapılır
+COLUMNS_SQL = (
+    "SELECT julianday(tarih), bolge, hareket, coalesce(CAST(set_sayisi AS REAL), 0), coalesce(CAST(tekrar AS REAL), 0), "
+    "coalesce(CAST(agirlik AS REAL), 0), coalesce(CAST(sure AS REAL), 0), coalesce(CAST(mesafe AS REAL), 0) FROM workouts"
+)
+UNIX_EPOCH_JD = 2440587.5
+
+
+# --- KOLONLAR ---
+def _codes(values):
+    """Metin kolonu -> (adlar, tamsayı kodlar). Farklı ad sayısı az: önce ham değerler
+    sözlükle kodlanır, sonra sadece adlar temizlenip ('Squat ' = 'Squat') kodlar birleştirilir.
+    """
+    raw = {v: i for i, v in enumerate(set(values))}
+    codes = np.fromiter(map(raw.__getitem__, values), dtype=np.int64, count=len(values))
+    names, remap = {}, np.empty(len(raw), dtype=np.int64)
+    for value, i in raw.items():
+        remap[i] = names.setdefault((value or '').strip(), len(names))
+    return list(names), remap[codes]
+
+
+def load_columns(conn):
+    """workouts'u kolon dizilerine çevirir. Metin kolonlar (bolge, hareket) tamsayı koda indirgenir."""
+    cur = conn.execute(COLUMNS_SQL)
+    cur.row_factory = None   # sqlite3.Row yerine düz tuple; zip(*rows) ile kolonlara ayrılıyor
+    rows = cur.fetchall()
+    if not rows: return None
+    jd, bolge, hareket, *numbers = zip(*rows)
+    jd = np.array(jd, dtype=np.float64)     # geçersiz tarih -> None -> nan
+    valid = ~np.isnan(jd)
+    if not valid.any(): return None
+    bolge_names, bolge_idx = _codes(bolge)
+    hareket_names, hareket_idx = _codes(hareket)
+    sets, tekrar, agirlik, sure, mesafe = (np.array(c, dtype=np.float64)[valid] for c in numbers)
+    return {
+        'day': np.floor(jd[valid] - UNIX_EPOCH_JD).astype(np.int64),   # 1970'ten beri gün
+        'bolge': bolge_idx[valid], 'bolge_names': bolge_names,
+        'hareket': hareket_idx[valid], 'hareket_names': hareket_names,
+        'sets': sets, 'tekrar': tekrar, 'agirlik': agirlik, 'sure': sure, 'mesafe': mesafe,
+    }
+
+
+def iso(days):
+    return np.datetime_as_string(np.asarray(days).astype('datetime64[D]')).tolist()
+
+
+def epley(agirlik, tekrar):
+    """Tahmini 1RM; tek tekrarda kaldırılan ağırlığın kendisi."""
+    return np.where(tekrar <= 1, agirlik, agirlik * (1 + tekrar / 30))
+
+
+# --- GRUPLAMA YARDIMCILARI ---
+def _segments(*keys):
+    """Sıralı anahtar dizilerinde her grubun başladığı indeksler."""
+    change = np.zeros(len(keys[0]), dtype=bool)
+    change[0] = True
+    for k in keys:
+        change[1:] |= k[1:] != k[:-1]
+    return np.flatnonzero(change)
+
+
+def _records(group, value):
+    """Grup (hareket) ve tarihe göre sıralı günlük değerlerde rekorlar.
+
+    Grup içi kümülatif maksimum, her gruba değerlerden büyük bir ofset eklenerek tek
+    np.maximum.accumulate ile bulunur. İlk kayıt taban sayılır, rekor değildir.
+    """
+    first = np.zeros(len(group), dtype=bool)
+    first[_segments(group)] = True
+    offset = group * (np.abs(value).max() * 2 + 1)
+    running = np.maximum.accumulate(value + offset) - offset
+    previous = np.empty_like(running)
+    previous[1:] = running[:-1]
+    return first, (value > previous + EPSILON) & ~first
+
+
+def _bounds(group):
+    starts = _segments(group)
+    return starts.tolist(), np.r_[starts[1:], len(group)].tolist()
+
+
+# --- HESAPLAMALAR ---
+def strength(cols, bolge_cardio):
+    """Hareket × gün en iyi seti (en yüksek e1RM) ve bunlar üzerinden PR'lar."""
+    m = ((cols['bolge'] != bolge_cardio) & (cols['agirlik'] > 0) & (cols['tekrar'] > 0)
+         & (cols['tekrar'] <= MAX_REPS))
+    g, d = cols['hareket'][m], cols['day'][m]
+    w, r, b = cols['agirlik'][m], cols['tekrar'][m], cols['bolge'][m]
+    if not len(g): return None
+    e = epley(w, r)
+    order = np.lexsort((e, d, g))          # grup, gün, e1RM artan: her günün son satırı en iyi set
+    g, d, e, w, r, b = g[order], d[order], e[order], w[order], r[order], b[order]
+    ends = np.r_[_segments(g, d)[1:], len(g)] - 1
+    g, d, e, w, r, b = g[ends], d[ends], e[ends], w[ends], r[ends], b[ends]
+    first, pr = _records(g, e)
+    return {'group': g, 'day': d, 'value': e, 'agirlik': w, 'tekrar': r, 'bolge': b, 'first': first, 'pr': pr}
+
+
+def cardio(cols, bolge_cardio):
+    """Hareket × gün toplam süre / mesafe -> tempo (dk/km). Düşük tempo daha iyi."""
+    m = (cols['bolge'] == bolge_cardio) & (cols['sure'] > 0) & (cols['mesafe'] > 0)
+    g, d, s, km = cols['hareket'][m], cols['day'][m], cols['sure'][m], cols['mesafe'][m]
+    if not len(g): return None
+    order = np.lexsort((d, g))
+    g, d, s, km = g[order], d[order], s[order], km[order]
+    starts = _segments(g, d)
+    s, km = np.add.reduceat(s, starts), np.add.reduceat(km, starts)
+    g, d = g[starts], d[starts]
+    pace = s / km
+    first, pr = _records(g, -pace)
+    return {'group': g, 'day': d, 'value': pace, 'sure': s, 'mesafe': km, 'first': first, 'pr': pr}
+
+
+def weekly_volume(cols, bolge_cardio, today):
+    """Son WEEKS haftanın (pazartesi başlangıçlı) bölge başına set × tekrar × ağırlık toplamı."""
+    week = cols['day'] - (cols['day'] + 3) % 7          # 1970-01-01 perşembe
+    this_week = today - (today + 3) % 7
+    first_week = this_week - 7 * (WEEKS - 1)
+    wi = (week - first_week) // 7
+    m = (wi >= 0) & (wi < WEEKS) & (cols['bolge'] != bolge_cardio)
+    nb = len(cols['bolge_names'])
+    volume = cols['sets'] * cols['tekrar'] * cols['agirlik']
+    grid = np.bincount(cols['bolge'][m] * WEEKS + wi[m], weights=volume[m], minlength=nb * WEEKS).reshape(nb, WEEKS)
+    keep = np.flatnonzero(grid.sum(axis=1) > 0)
+    return {
+        'weeks': iso(first_week + 7 * np.arange(WEEKS)),
+        'bolgeler': [{'bolge': cols['bolge_names'][i], 'hacim': np.round(grid[i]).tolist()} for i in keep],
+    }
+
+
+def streaks(day, today):
+    """fitness() takvimiyle aynı 'aktif gün' tanımı: o gün en az bir kayıt var."""
+    days = np.unique(day[day <= today])
+    if not len(days): return {'current': 0, 'longest': 0, 'active_30': 0, 'last': None}
+    starts = np.r_[0, np.flatnonzero(np.diff(days) != 1) + 1]
+    lengths = np.diff(np.r_[starts, len(days)])
+    # Bugün henüz antrenman yoksa dünkü seri hâlâ sürüyor sayılır
+    current = int(lengths[-1]) if days[-1] >= today - 1 else 0
+    return {'current': current, 'longest': int(lengths.max()),
+            'active_30': int((days > today - 30).sum()), 'last': iso(days[-1])}
+
+
+def _summaries(res, names, kind, better):
+    """Hareket başına oturum, en iyi, son değer ve PR sayısı."""
+    starts = _segments(res['group'])
+    ends = np.r_[starts[1:], len(res['group'])] - 1
+    sessions, prs = ends - starts + 1, np.add.reduceat(res['pr'].astype(np.int64), starts)
+    # En iyi değerin günü: grubun son rekoru (rekor yoksa ilk kayıt)
+    record_pos = np.where(res['pr'] | res['first'], np.arange(len(res['group'])), -1)
+    best = np.maximum.reduceat(record_pos, starts)
+    value = np.round(res['value'], 2)
+    out = []
+    for i, s, e, bi, n, p in zip(res['group'][starts].tolist(), starts.tolist(), ends.tolist(),
+                                 best.tolist(), sessions.tolist(), prs.tolist()):
+        out.append({'hareket': names[i], 'kind': kind, 'sessions': n, 'prs': p, 'better': better,
+                    'best': value[bi].item(), 'best_date': iso(res['day'][bi]),
+                    'last': value[e].item(), 'last_date': iso(res['day'][e])})
+    return out
+
+
+def build(cols, today):
+    names = cols['hareket_names']
+    cardio_idx = cols['bolge_names'].index(CARDIO) if CARDIO in cols['bolge_names'] else -1
+    st, ca = strength(cols, cardio_idx), cardio(cols, cardio_idx)
+    series, hareketler, prs = {}, [], []
+    if st:
+        hareketler += [dict(h, bolge=cols['bolge_names'][b]) for h, b in zip(
+            _summaries(st, names, 'strength', 'higher'),
+            st['bolge'][np.r_[_segments(st['group'])[1:], len(st['group'])] - 1].tolist())]
+        recent = np.flatnonzero(st['pr'])
+        recent = recent[np.argsort(-st['day'][recent], kind='stable')][:RECENT_PRS]
+        prs = [{'hareket': names[st['group'][i]], 'tarih': iso(st['day'][i]), 'e1rm': round(float(st['value'][i]), 1),
+                'agirlik': float(st['agirlik'][i]), 'tekrar': int(st['tekrar'][i])} for i in recent.tolist()]
+        for s, e in zip(*_bounds(st['group'])):
+            series[names[st['group'][s]]] = {'kind': 'strength', 'day': st['day'][s:e], 'value': st['value'][s:e],
+                                             'pr': st['pr'][s:e], 'agirlik': st['agirlik'][s:e], 'tekrar': st['tekrar'][s:e]}
+    if ca:
+        hareketler += [dict(h, bolge=CARDIO) for h in _summaries(ca, names, 'cardio', 'lower')]
+        for s, e in zip(*_bounds(ca['group'])):
+            series[names[ca['group'][s]]] = {'kind': 'cardio', 'day': ca['day'][s:e], 'value': ca['value'][s:e],
+                                             'pr': ca['pr'][s:e], 'sure': ca['sure'][s:e], 'mesafe': ca['mesafe'][s:e]}
+    hareketler.sort(key=lambda h: -h['sessions'])
+    overview = {
+        'streak': streaks(cols['day'], today),
+        'weekly': weekly_volume(cols, cardio_idx, today),
+        'hareketler': hareketler,
+        'prs': prs,
+    }
+    return overview, series
+
+
+EMPTY = ({'streak': {'current': 0, 'longest': 0, 'active_30': 0, 'last': None},
+          'weekly': {'weeks': [], 'bolgeler': []}, 'hareketler': [], 'prs': []}, {})
+
+
+# --- GİRİŞ NOKTALARI ---
+def compute(conn, today=None):
+    """(özet, seriler); veri sürümü ve gün değişmedikçe tekrar hesaplanmaz."""
+    today = today or date.today()
+    key = (cache.data_version(conn), today)
+    hit = _memo.get(key)
+    if hit is not None: return hit
+    cols = load_columns(conn)
+    result = build(cols, np.datetime64(today, 'D').astype(np.int64)) if cols else EMPTY
+    _memo.put(key, result)
+    return result
+
+
+def overview(conn):
+    return compute(conn)[0]
+
+
+def series(conn, hareket):
+    """Tek hareketin günlük zaman serisi; yoksa None. Kuvvette değer e1RM, kardiyoda dk/km tempo."""
+    s = compute(conn)[1].get(hareket)
+    if s is None: return None
+    out = {'hareket': hareket, 'kind': s['kind'], 'dates': iso(s['day']),
+           'values': np.round(s['value'], 2).tolist(), 'pr': s['pr'].tolist()}
+    for extra in ('agirlik', 'tekrar', 'sure', 'mesafe'):
+        if extra in s: out[extra] = np.round(s[extra], 2).tolist()
+    return out
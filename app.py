@@ -1,28 +1,31 @@
+import click
+import json
 import os
-import sqlite3
 import pyotp
 import random
 from datetime import datetime, timedelta
 from functools import wraps
-from flask import Flask, render_template, request, redirect, url_for, Response, session, flash
+from flask import Flask, render_template, request, redirect, url_for, Response, session, flash, jsonify
+from flask.cli import AppGroup
 from itertools import groupby
+import analytics
+import assets
+import db
+import foods
+import metrics
+from cache import versioned
+import rollups
+from db import get_db
 
 app = Flask(__name__)
 app.secret_key = os.environ.get('SECRET_KEY', 'om_final_v300')
 app.permanent_session_lifetime = timedelta(days=90)
-
-BASE_DIR = os.path.abspath(os.path.dirname(__file__))
-
-# --- İŞTE ÇÖZÜM BURADA: İSMİ DEĞİŞTİRDİM ---
-# Eski bozuk dosya yerine tertemiz bir dosya açacak.
-DB_NAME = os.path.join(BASE_DIR, "lifeos_new.db") 
-
-def get_db_connection():
-    conn = sqlite3.connect(DB_NAME)
-    conn.row_factory = sqlite3.Row
-    return conn
+db.init_app(app)
+metrics.init_app(app)
+assets.init_app(app)
 
 # --- GÜVENLİK ---
+@metrics.timed('lifeos_auth_check_seconds')
 def check_auth(username, password):
     if username != 'Muhammed': return False 
     secret = os.environ.get('TOTP_SECRET')
@@ -41,123 +44,306 @@ def requires_auth(f):
     return decorated
 
 # --- DB KURULUM ---
-def init_db():
-    conn = get_db_connection()
+# Şema artık migrations/ altındaki sıralı göçlerle yönetiliyor; worker'lar açılışta DDL çalıştırmaz.
+@app.cli.command('migrate')
+def migrate_command():
+    """Bekleyen şema göçlerini uygula."""
+    applied = db.migrate()
+    for name in applied: print(f"Uygulandı: {name}")
+    if not applied: print("Şema güncel.")
+
+def check_schema():
+    conn = db.connect()
     try:
-        conn.execute('CREATE TABLE IF NOT EXISTS supplements_def (id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT, dozaj TEXT)')
-        conn.execute('CREATE TABLE IF NOT EXISTS supplement_logs (id INTEGER PRIMARY KEY AUTOINCREMENT, sup_id INTEGER, tarih TEXT)')
-        conn.execute('CREATE TABLE IF NOT EXISTS shortcuts (id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT, url TEXT, icon TEXT, color_theme TEXT)')
-        
-        # Workouts Tablosunu Sıfırdan Temiz Kuruyoruz
-        conn.execute('''CREATE TABLE IF NOT EXISTS workouts (
-            id INTEGER PRIMARY KEY AUTOINCREMENT, 
-            bolge TEXT, hareket TEXT, 
-            set_sayisi INTEGER DEFAULT 0, tekrar INTEGER DEFAULT 0, agirlik REAL DEFAULT 0, 
-            sure INTEGER DEFAULT 0, mesafe REAL DEFAULT 0, 
-            tarih TEXT
-        )''')
-
-        # Varsayılanlar
-        cur = conn.execute('SELECT count(*) FROM supplements_def')
-        if cur.fetchone()[0] == 0:
-            defaults = [('Creatine', '5g'), ('Whey Protein', '1 Ölçek'), ('Pre-Workout', '1 Ölçek')]
-            conn.executemany('INSERT INTO supplements_def (name, dozaj) VALUES (?, ?)', defaults)
-            
-        conn.commit()
-    except Exception as e:
-        print(f"DB HATASI: {e}")
+        pending = db.pending_migrations(conn)
     finally:
         conn.close()
+    if pending:
+        print(f"UYARI: {len(pending)} göç bekliyor ({pending[0][1]}...). Çalıştır: flask --app app migrate")
+
+check_schema()
+
+rollup_cli = AppGroup('rollups', help='Analiz özet tabloları.')
+app.cli.add_command(rollup_cli)
+
+@rollup_cli.command('rebuild')
+def rollups_rebuild_command():
+    """Özetleri ham satırlardan yeniden hesapla."""
+    db.write(rollups.rebuild, conn=db.connect())
+    print("Özetler yeniden hesaplandı.")
+
+@rollup_cli.command('check')
+def rollups_check_command():
+    """Özetleri ham satırlarla karşılaştır."""
+    diffs = rollups.check(db.connect())
+    for table, key, expected, actual in diffs:
+        print(f"{table} {key}: beklenen={expected} mevcut={actual}")
+    print(f"{len(diffs)} fark." if diffs else "Tutarlı.")
+    if diffs: raise SystemExit(1)
 
-init_db()
+food_cli = AppGroup('foods', help='Yerel besin kataloğu.')
+app.cli.add_command(food_cli)
+
+@food_cli.command('load')
+@click.argument('path')
+@click.option('--batch', default=foods.LOAD_BATCH, show_default=True, help='Transaction başına satır.')
+@click.option('--delimiter', default=None, help='CSV ayracı (varsayılan: .tsv ise TAB, değilse virgül).')
+def foods_load_command(path, batch, delimiter):
+    """CSV/TSV/JSONL (.gz) ürün dökümünü kataloğa yükle."""
+    progress = lambda n, skip: print(f"\r{n} ürün yüklendi, {skip} atlandı", end='', flush=True)
+    loaded, skipped = foods.load(path, batch_size=batch, delimiter=delimiter, progress=progress)
+    print(f"\r{loaded} ürün yüklendi, {skipped} atlandı.")
+
+asset_cli = AppGroup('assets', help='Statik dosyalar: ikon alt kümesi, parmak izi, sıkıştırma.')
+app.cli.add_command(asset_cli)
+
+@asset_cli.command('icons')
+def assets_icons_command():
+    """Font Awesome'ı şablonlarda kullanılan ikonlara indir (static/vendor/fontawesome)."""
+    try:
+        version, glyphs, missing = assets.subset_icons()
+    except RuntimeError as e:
+        raise click.ClickException(str(e))
+    print(f"Font Awesome {version}: {glyphs} ikon.")
+    if missing: print(f"UYARI: bulunamayan sınıflar: {', '.join(missing)}")
+
+@asset_cli.command('build')
+def assets_build_command():
+    """static/ kaynaklarını static/dist altına parmak izli ve sıkıştırılmış olarak derle."""
+    mapping = assets.build(progress=lambda name, out: print(f"{name} -> dist/{out}"))
+    print(f"{len(mapping)} dosya, manifest: static/dist/manifest.json")
 
 # --- PING BOTU İÇİN ÖZEL ROTA ---
 @app.route('/ping')
 def ping():
     return "Pong! Sunucu uyanik.", 200
 
+# --- YAZMA İŞLEMLERİ ---
+# db.write() içinde çalışırlar; kilitte tekrar denenebilecekleri için flash vb. yapmazlar, mesaj döndürürler.
+
+def dashboard_mutation(conn, form):
+    """Değişen kaydı döndürür (/api/sync için)."""
+    if 'add_shortcut' in form:
+        url = form.get('url')
+        if not url.startswith('http'): url = 'https://' + url
+        icons, colors = ['globe', 'link', 'star', 'bolt'], ['blue', 'purple', 'orange', 'green']
+        row = conn.execute('INSERT INTO shortcuts (name, url, icon, color_theme) VALUES (?, ?, ?, ?) RETURNING *', 
+                           (form.get('name'), url, random.choice(icons), random.choice(colors))).fetchone()
+        return {'shortcut': dict(row)}
+    elif 'del_shortcut' in form:
+        conn.execute('DELETE FROM shortcuts WHERE id = ?', (form.get('s_id'),))
+        return {'deleted_shortcut': int(form.get('s_id'))}
+    return {}
+
+def fitness_mutation(conn, form, bugun):
+    """(flash mesajı, değişen kayıt) döndürür; JSON istekleri sadece değişen kaydı alır."""
+    if 'toggle_sup' in form:
+        sid = int(form.get('sup_id'))
+        # UNIQUE(sup_id, tarih) sayesinde varsa tek DELETE, yoksa tek INSERT
+        taken = conn.execute('DELETE FROM supplement_logs WHERE sup_id=? AND tarih=?', (sid, bugun)).rowcount == 0
+        if taken: conn.execute('INSERT INTO supplement_logs (sup_id, tarih) VALUES (?,?)', (sid, bugun))
+        return None, {'supplement': {'id': sid, 'taken': taken}}
+    
+    elif 'add_sup_def' in form:
+        row = conn.execute('INSERT INTO supplements_def (name, dozaj) VALUES (?,?) RETURNING *', (form.get('name'), form.get('dozaj'))).fetchone()
+        return None, {'supplement': dict(row, taken=False)}
+    elif 'del_sup_def' in form:
+        conn.execute('DELETE FROM supplements_def WHERE id=?', (form.get('sup_id'),))
+        return None, {'deleted_supplement': int(form.get('sup_id'))}
+
+    elif 'add_workout' in form:
+        bolge = form.get('bolge')
+        if bolge == 'Kardiyo':
+            row = conn.execute('INSERT INTO workouts (bolge, hareket, sure, mesafe, tarih) VALUES (?,?,?,?,?) RETURNING *',
+                               (bolge, form.get('hareket'), form.get('sure') or 0, form.get('mesafe') or 0, bugun)).fetchone()
+        else:
+            row = conn.execute('INSERT INTO workouts (bolge, hareket, set_sayisi, tekrar, agirlik, tarih) VALUES (?,?,?,?,?,?) RETURNING *',
+                               (bolge, form.get('hareket'), form.get('sets') or 0, form.get('tekrar') or 0, form.get('agirlik') or 0, bugun)).fetchone()
+        return ('Kaydedildi', 'success'), {'workout': dict(row)}
+
+    elif 'edit_workout' in form:
+        w_id = form.get('w_id')
+        bolge = form.get('bolge')
+        if bolge == 'Kardiyo':
+            row = conn.execute('UPDATE workouts SET hareket=?, sure=?, mesafe=? WHERE id=? RETURNING *',
+                               (form.get('hareket'), form.get('sure'), form.get('mesafe'), w_id)).fetchone()
+        else:
+            row = conn.execute('UPDATE workouts SET hareket=?, set_sayisi=?, tekrar=?, agirlik=? WHERE id=? RETURNING *',
+                               (form.get('hareket'), form.get('sets'), form.get('tekrar'), form.get('agirlik'), w_id)).fetchone()
+        return ('Güncellendi', 'info'), {'workout': dict(row) if row else None}
+
+    elif 'del_workout' in form:
+        conn.execute('DELETE FROM workouts WHERE id=?', (form.get('w_id'),))
+        return None, {'deleted_workout': int(form.get('w_id'))}
+
+    return None, {}
+
+# --- TOPLU SENKRON (/api/sync) ---
+# Mutasyon verisi form alanlarıyla aynı: hareket, bolge, sets, tekrar, agirlik, sure, mesafe, w_id,
+# sup_id, name, dozaj, url, s_id. Kimlik alanları aynı paketteki (veya daha önce uygulanmış) bir
+# ekleme mutasyonuna {"ref": "<anahtar>"} ile başvurabilir: çevrimdışı eklenip düzenlenen kayıtlar için.
+SYNC_OPS = {
+    'add_workout': 'fitness', 'edit_workout': 'fitness', 'del_workout': 'fitness', 'toggle_sup': 'fitness',
+    'add_sup_def': 'fitness', 'del_sup_def': 'fitness', 'add_shortcut': 'dashboard', 'del_shortcut': 'dashboard',
+}
+SYNC_MAX_BATCH = 500
+SYNC_KEY_DAYS = 30
+
+def _sync_result(conn, key, batch):
+    if key in batch: return batch[key]
+    row = conn.execute('SELECT result FROM sync_keys WHERE key=?', (key,)).fetchone()
+    return json.loads(row[0]) if row else None
+
+def _resolve_ref(conn, value, batch):
+    if not isinstance(value, dict): return value
+    res = _sync_result(conn, value.get('ref'), batch) or {}
+    created = res.get('workout') or res.get('supplement') or res.get('shortcut') or {}
+    if not created.get('id'): raise ValueError(f"Çözülemeyen referans: {value.get('ref')}")
+    return created['id']
+
+def sync_mutations(conn, mutations, bugun):
+    """Paketi tek transaction'da uygular (db.write içinde). Her mutasyon kendi SAVEPOINT'inde:
+    biri hata verirse sadece o geri alınır, sonucu yine kaydedilir ki istemci sonsuza dek tekrar göndermesin.
+    """
+    conn.execute("DELETE FROM sync_keys WHERE created_at < datetime('now', ?)", (f'-{SYNC_KEY_DAYS} days',))
+    batch, results = {}, []
+    for m in mutations:
+        key = m['key']
+        if 'invalid' in m:
+            results.append({'key': key, 'ok': False, 'error': m['invalid']})
+            continue
+        res = _sync_result(conn, key, batch)
+        if res is not None:
+            results.append(dict(res, key=key, replayed=True))
+            continue
+        conn.execute('SAVEPOINT sync_m')
+        try:
+            form = {k: _resolve_ref(conn, v, batch) for k, v in m['data'].items() if k not in SYNC_OPS}
+            form[m['op']] = '1'
+            tarih = m.get('tarih') or bugun
+            datetime.strptime(tarih, "%Y-%m-%d")
+            if SYNC_OPS[m['op']] == 'dashboard':
+                change = dashboard_mutation(conn, form)
+            else:
+                change = fitness_mutation(conn, form, tarih)[1]
+            res = dict(change, ok=True)
+            conn.execute('RELEASE sync_m')
+        except Exception as e:
+            conn.execute('ROLLBACK TO sync_m')
+            conn.execute('RELEASE sync_m')
+            res = {'ok': False, 'error': str(e)}
+        conn.execute("INSERT INTO sync_keys (key, result, created_at) VALUES (?, ?, datetime('now'))", (key, json.dumps(res)))
+        batch[key] = res
+        results.append(dict(res, key=key))
+    return results
+
+def parse_sync_batch(body):
+    """Paket biçimi bozuksa ValueError (400). Tek tek bozuk mutasyonlar paketi düşürmez:
+    {'key', 'invalid'} olarak işaretlenir, sync_mutations bunlar için ok:false sonucu döner.
+    """
+    mutations = body.get('mutations') if isinstance(body, dict) else None
+    if not isinstance(mutations, list) or len(mutations) > SYNC_MAX_BATCH:
+        raise ValueError(f"'mutations' en fazla {SYNC_MAX_BATCH} elemanlı bir liste olmalı")
+    parsed = []
+    for m in mutations:
+        key = m.get('key') if isinstance(m, dict) else None
+        if not (isinstance(key, str) and 0 < len(key) <= 100 and m.get('op') in SYNC_OPS
+                and isinstance(m.get('data', {}), dict)):
+            parsed.append({'key': key if isinstance(key, str) else None, 'invalid': f"Geçersiz mutasyon: {m!r}"[:200]})
+            continue
+        parsed.append({'key': key, 'op': m['op'], 'data': m.get('data', {}), 'tarih': m.get('tarih')})
+    return parsed
+
+# --- ZAMAN ÇİZELGESİ ---
+TIMELINE_PAGE = 50
+TIMELINE_MAX_PAGE = 200
+
+def day_label(tarih, bugun):
+    if tarih == bugun: return "Bugün"
+    if tarih == (datetime.now() - timedelta(days=1)).strftime("%Y-%m-%d"): return "Dün"
+    return datetime.strptime(tarih, "%Y-%m-%d").strftime("%d.%m.%Y")
+
+def workout_page(conn, cursor=None, limit=TIMELINE_PAGE):
+    """Keyset sayfalama: (tarih, id) imlecinden eskiye doğru. (satırlar, sonraki imleç) döndürür."""
+    if cursor:
+        tarih, w_id = cursor
+        rows = conn.execute('SELECT * FROM workouts WHERE (tarih, id) < (?, ?) ORDER BY tarih DESC, id DESC LIMIT ?',
+                            (tarih, w_id, limit + 1)).fetchall()
+    else:
+        rows = conn.execute('SELECT * FROM workouts ORDER BY tarih DESC, id DESC LIMIT ?', (limit + 1,)).fetchall()
+    # Bir fazla satır çekilir: varsa sonraki sayfa da var demektir
+    more = len(rows) > limit
+    rows = rows[:limit]
+    return rows, (f"{rows[-1]['tarih']}_{rows[-1]['id']}" if more else None)
+
+def parse_cursor(value):
+    if not value: return None
+    tarih, _, w_id = value.rpartition('_')
+    datetime.strptime(tarih, "%Y-%m-%d")  # geçersizse ValueError
+    return tarih, int(w_id)
+
+def group_by_day(rows, bugun):
+    return [{'tarih': tarih, 'date': day_label(tarih, bugun), 'items': list(items)}
+            for tarih, items in groupby(rows, key=lambda x: x['tarih'])]
+
+def wants_json():
+    return request.accept_mimetypes.best_match(['text/html', 'application/json']) == 'application/json'
+
+# --- ÖLÇÜM ---
+# Varsayılan olarak diğer sayfalar gibi giriş ister. Scraper için METRICS_TOKEN tanımlanırsa
+# 'Authorization: Bearer <token>' de kabul edilir; sadece METRICS_PUBLIC=1 ile herkese açılır.
+def requires_metrics_auth(f):
+    @wraps(f)
+    def decorated(*args, **kwargs):
+        if os.environ.get('METRICS_PUBLIC') == '1': return f(*args, **kwargs)
+        token = os.environ.get('METRICS_TOKEN')
+        if token and request.headers.get('Authorization') == f'Bearer {token}': return f(*args, **kwargs)
+        return requires_auth(f)(*args, **kwargs)
+    return decorated
+
+@app.route('/metrics')
+@requires_metrics_auth
+def metrics_endpoint():
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
+
 # --- ROTALAR ---
 
 @app.route('/', methods=['GET', 'POST'])
 @requires_auth
+@versioned
 def dashboard():
-    conn = get_db_connection()
+    conn = get_db()
     if request.method == 'POST':
-        if 'add_shortcut' in request.form:
-            url = request.form.get('url')
-            if not url.startswith('http'): url = 'https://' + url
-            icons, colors = ['globe', 'link', 'star', 'bolt'], ['blue', 'purple', 'orange', 'green']
-            conn.execute('INSERT INTO shortcuts (name, url, icon, color_theme) VALUES (?, ?, ?, ?)', 
-                         (request.form.get('name'), url, random.choice(icons), random.choice(colors)))
-        elif 'del_shortcut' in request.form:
-            conn.execute('DELETE FROM shortcuts WHERE id = ?', (request.form.get('s_id'),))
-        conn.commit()
+        db.write(dashboard_mutation, request.form)
     shortcuts = conn.execute('SELECT * FROM shortcuts').fetchall()
-    conn.close()
     return render_template('dashboard.html', shortcuts=shortcuts)
 
 @app.route('/fitness', methods=['GET', 'POST'])
 @requires_auth
+@versioned
 def fitness():
-    conn = get_db_connection()
+    conn = get_db()
     bugun = datetime.now().strftime("%Y-%m-%d")
     
     if request.method == 'POST':
         try:
-            if 'toggle_sup' in request.form:
-                sid = request.form.get('sup_id')
-                check = conn.execute('SELECT id FROM supplement_logs WHERE sup_id=? AND tarih=?', (sid, bugun)).fetchone()
-                if check: conn.execute('DELETE FROM supplement_logs WHERE id=?', (check['id'],))
-                else: conn.execute('INSERT INTO supplement_logs (sup_id, tarih) VALUES (?,?)', (sid, bugun))
-            
-            elif 'add_sup_def' in request.form:
-                conn.execute('INSERT INTO supplements_def (name, dozaj) VALUES (?,?)', (request.form.get('name'), request.form.get('dozaj')))
-            elif 'del_sup_def' in request.form:
-                conn.execute('DELETE FROM supplements_def WHERE id=?', (request.form.get('sup_id'),))
-
-            elif 'add_workout' in request.form:
-                bolge = request.form.get('bolge')
-                if bolge == 'Kardiyo':
-                    conn.execute('INSERT INTO workouts (bolge, hareket, sure, mesafe, tarih) VALUES (?,?,?,?,?)',
-                                 (bolge, request.form.get('hareket'), request.form.get('sure') or 0, request.form.get('mesafe') or 0, bugun))
-                else:
-                    conn.execute('INSERT INTO workouts (bolge, hareket, set_sayisi, tekrar, agirlik, tarih) VALUES (?,?,?,?,?,?)',
-                                 (bolge, request.form.get('hareket'), request.form.get('sets') or 0, request.form.get('tekrar') or 0, request.form.get('agirlik') or 0, bugun))
-                flash('Kaydedildi', 'success')
-
-            elif 'edit_workout' in request.form:
-                w_id = request.form.get('w_id')
-                bolge = request.form.get('bolge')
-                if bolge == 'Kardiyo':
-                    conn.execute('UPDATE workouts SET hareket=?, sure=?, mesafe=? WHERE id=?',
-                                 (request.form.get('hareket'), request.form.get('sure'), request.form.get('mesafe'), w_id))
-                else:
-                    conn.execute('UPDATE workouts SET hareket=?, set_sayisi=?, tekrar=?, agirlik=? WHERE id=?',
-                                 (request.form.get('hareket'), request.form.get('sets'), request.form.get('tekrar'), request.form.get('agirlik'), w_id))
-                flash('Güncellendi', 'info')
-
-            elif 'del_workout' in request.form:
-                conn.execute('DELETE FROM workouts WHERE id=?', (request.form.get('w_id'),))
-
-            conn.commit()
+            msg, change = db.write(fitness_mutation, request.form, bugun)
         except Exception as e:
+            if wants_json(): return jsonify(ok=False, error=str(e)), 400
             flash(f"Hata: {str(e)}", "danger")
-        
+            return redirect(url_for('fitness'))
+        # fetch ile gelen istek: yönlendirme + tam sayfa yerine sadece değişen kayıt
+        if wants_json(): return jsonify(ok=True, **change)
+        if msg: flash(*msg)
         return redirect(url_for('fitness'))
 
     sups = conn.execute('SELECT * FROM supplements_def').fetchall()
     taken = [r['sup_id'] for r in conn.execute('SELECT sup_id FROM supplement_logs WHERE tarih=?', (bugun,)).fetchall()]
     sup_list = [{'id':s['id'], 'name':s['name'], 'dozaj':s['dozaj'], 'taken':(s['id'] in taken)} for s in sups]
     
-    # Geçmiş Listesi
-    all_workouts = conn.execute('SELECT * FROM workouts ORDER BY tarih DESC, id DESC LIMIT 50').fetchall()
-    timeline = []
-    for date, items in groupby(all_workouts, key=lambda x: x['tarih']):
-        date_obj = datetime.strptime(date, "%Y-%m-%d")
-        if date == bugun: d_display = "Bugün"
-        elif date == (datetime.now() - timedelta(days=1)).strftime("%Y-%m-%d"): d_display = "Dün"
-        else: d_display = date_obj.strftime("%d.%m.%Y")
-        timeline.append({'date': d_display, 'items': list(items)})
+    # Geçmiş Listesi: ilk sayfa burada, devamı kaydırdıkça /api/workouts'tan
+    rows, next_cursor = workout_page(conn)
+    timeline = group_by_day(rows, bugun)
 
     # Takvim
     calendar = []
@@ -167,25 +353,91 @@ def fitness():
         d_str = dt.strftime("%Y-%m-%d")
         calendar.append({'day': dt.strftime("%a"), 'active': (d_str in active), 'is_today': (d_str == bugun)})
     
-    conn.close()
-    return render_template('fitness.html', supplements=sup_list, timeline=timeline, calendar=calendar)
+    return render_template('fitness.html', supplements=sup_list, timeline=timeline, next_cursor=next_cursor, calendar=calendar, bugun=bugun)
+
+@app.route('/api/workouts')
+@requires_auth
+def api_workouts():
+    """Güne göre gruplanmış geçmiş. ?cursor=<tarih>_<id>&limit=N; yanıt gün gün akıtılır."""
+    try:
+        cursor = parse_cursor(request.args.get('cursor'))
+        limit = min(max(int(request.args.get('limit', TIMELINE_PAGE)), 1), TIMELINE_MAX_PAGE)
+    except ValueError:
+        return jsonify(ok=False, error='Geçersiz cursor/limit'), 400
+    bugun = datetime.now().strftime("%Y-%m-%d")
+    rows, next_cursor = workout_page(get_db(), cursor, limit)
+    days = group_by_day(rows, bugun)
+
+    def generate():
+        yield '{"days": ['
+        for i, day in enumerate(days):
+            yield (',' if i else '') + json.dumps(dict(day, items=[dict(r) for r in day['items']]), ensure_ascii=False)
+        yield '], "next": ' + json.dumps(next_cursor) + '}'
+    return Response(generate(), mimetype='application/json')
+
+@app.route('/api/sync', methods=['POST'])
+@requires_auth
+def api_sync():
+    """Sıralı mutasyon paketi: {"mutations": [{"key", "op", "data", "tarih"?}, ...]}."""
+    try:
+        mutations = parse_sync_batch(request.get_json(silent=True))
+    except ValueError as e:
+        return jsonify(ok=False, error=str(e)), 400
+    bugun = datetime.now().strftime("%Y-%m-%d")
+    return jsonify(ok=True, results=db.write(sync_mutations, mutations, bugun))
+
+@app.route('/sw.js')
+def service_worker():
+    # Kapsamı '/' olsun diye kökten servis edilir; güncellemeler hemen alınsın diye önbelleklenmez.
+    # Şablondur: parmak izli dosya adları değişince içerik (ve tarayıcıdaki SW) da değişir.
+    urls = [url_for('asset', filename=name) for name in assets.manifest().values()]
+    resp = Response(render_template('sw.js', assets=sorted(urls)), mimetype='text/javascript')
+    resp.headers['Cache-Control'] = 'no-cache'
+    return resp
+
+@app.route('/scanner')
+@requires_auth
+def scanner():
+    return render_template('scanner.html')
+
+@app.route('/api_search')
+@requires_auth
+def api_search():
+    q = request.args.get('q', '')
+    kind = 'barcode' if request.args.get('type') == 'barcode' else 'text'
+    if len(q.strip()) < 2: return jsonify([])
+    return jsonify(foods.search(get_db(), q, kind))
 
 @app.route('/analysis')
 @requires_auth
+@versioned
 def analysis():
-    conn = get_db_connection()
+    conn = get_db()
     try:
-        total = conn.execute('SELECT count(*) FROM workouts').fetchone()[0] or 0
-        fav = conn.execute('SELECT bolge FROM workouts GROUP BY bolge ORDER BY count(*) DESC LIMIT 1').fetchone()
-        fav_text = fav['bolge'] if fav else "Yok"
-        sup_score = conn.execute("SELECT count(*) FROM supplement_logs WHERE tarih >= date('now', '-30 days')").fetchone()[0] or 0
-        rows = conn.execute('SELECT bolge, count(*) as c FROM workouts GROUP BY bolge').fetchall()
-        labels, data = [r['bolge'] for r in rows], [r['c'] for r in rows]
+        # Özet tablolardan okur (rollups.py), geçmiş büyüdükçe yavaşlamaz
+        ozet = rollups.summary(conn)
+        total, fav_text, sup_score = ozet['total'], ozet['fav'] or "Yok", ozet['sup']
+        labels, data = ozet['labels'], ozet['data']
     except:
         total, fav_text, sup_score, labels, data = 0, "-", 0, [], []
-    finally:
-        conn.close()
     return render_template('analysis.html', total=total, fav=fav_text, sup=sup_score, labels=labels, data=data)
 
+@app.route('/api/analytics')
+@requires_auth
+@versioned
+def api_analytics():
+    """Seri, bölge başına haftalık hacim, hareket özetleri (e1RM / tempo) ve son PR'lar."""
+    return jsonify(analytics.overview(get_db()))
+
+@app.route('/api/analytics/series')
+@requires_auth
+@versioned
+def api_analytics_series():
+    """Tek hareketin günlük serisi: ?hareket=<ad>. Kuvvette tahmini 1RM, kardiyoda dk/km tempo."""
+    series = analytics.series(get_db(), request.args.get('hareket', ''))
+    if series is None: return jsonify(ok=False, error='Hareket bulunamadı'), 404
+    return jsonify(series)
+
 if __name__ == '__main__':
+    db.migrate()
     app.run(debug=True, host='0.0.0.0', port=5050)
\ No newline at end of file
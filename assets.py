@@ -0,0 +1,217 @@
+"""Statik dosya hattı: ikon alt kümesi, parmak izli dosya adları, gzip/brotli kopyaları.
+
+Kaynaklar static/ altında durur (css/, js/, vendor/). `flask assets build` her dosyayı
+static/dist/<ad>.<özet>.<uzantı> olarak kopyalar, sıkıştırılmış kopyalarını yanına yazar
+ve static/dist/manifest.json'a kaydeder. Şablonlar asset_url('css/app.css') ile çağırır;
+manifest yoksa (derlenmemiş geliştirme ortamı) kaynak dosyanın /static adresi döner.
+Derleme çıktısı repoya dahildir, deploy sırasında adım gerekmez.
+"""
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import re
+
+from flask import request, send_from_directory, url_for
+
+import db
+
+STATIC_DIR = os.path.join(db.BASE_DIR, 'static')
+TEMPLATES_DIR = os.path.join(db.BASE_DIR, 'templates')
+DIST_DIR = os.path.join(STATIC_DIR, 'dist')
+MANIFEST = os.path.join(DIST_DIR, 'manifest.json')
+SOURCES = ('css', 'js', 'vendor')        # static/ altında parmak izlenecek klasörler
+COMPRESS = ('.css', '.js', '.svg', '.json')   # woff2/png zaten sıkışık
+MIN_COMPRESS = 512                        # bundan küçük dosyada sıkıştırma başlıktan pahalı
+HASH_LEN = 10
+IMMUTABLE = 'public, max-age=31536000, immutable'
+
+FA_DIR = os.path.join(STATIC_DIR, 'vendor', 'fontawesome')
+FA_BASE = ('fa', 'fas', 'fa-solid')
+
+_manifest = None
+
+
+# --- MANİFEST / URL ---
+def manifest():
+    global _manifest
+    if _manifest is None:
+        try:
+            with open(MANIFEST, encoding='utf-8') as f:
+                _manifest = json.load(f)
+        except FileNotFoundError:
+            _manifest = {}
+    return _manifest
+
+
+def asset_url(name):
+    """Derlenmiş (parmak izli) adres; derlenmemişse kaynak dosyanın /static adresi."""
+    hashed = manifest().get(name)
+    if hashed: return url_for('asset', filename=hashed)
+    return url_for('static', filename=name)
+
+
+# --- SERVİS ---
+def serve(filename):
+    """Parmak izli dosyayı sıkıştırılmış kopyasıyla ve değişmez önbellek başlığıyla gönderir."""
+    accepted = request.accept_encodings
+    for encoding, ext in (('br', '.br'), ('gzip', '.gz')):
+        if accepted[encoding] and os.path.isfile(os.path.join(DIST_DIR, filename + ext)):
+            resp = send_from_directory(DIST_DIR, filename + ext, max_age=31536000)
+            resp.headers['Content-Encoding'] = encoding
+            resp.mimetype = mimetypes.guess_type(filename)[0] or 'application/octet-stream'
+            break
+    else:
+        resp = send_from_directory(DIST_DIR, filename, max_age=31536000)
+    resp.headers['Cache-Control'] = IMMUTABLE
+    resp.vary.add('Accept-Encoding')
+    return resp
+
+
+def init_app(app):
+    app.add_url_rule('/static/dist/<path:filename>', 'asset', serve)
+    app.jinja_env.globals['asset_url'] = asset_url
+
+
+# --- DERLEME ---
+def _fingerprint(name, data):
+    root, ext = os.path.splitext(name)
+    return f"{root}.{hashlib.sha256(data).hexdigest()[:HASH_LEN]}{ext}"
+
+
+def _sources():
+    for folder in SOURCES:
+        for root, _, files in os.walk(os.path.join(STATIC_DIR, folder)):
+            for fn in sorted(files):
+                if fn.startswith('.') or fn.endswith(('.md', '.txt', '.py')): continue
+                yield os.path.relpath(os.path.join(root, fn), STATIC_DIR).replace(os.sep, '/')
+
+
+def _rewrite_css(name, text, mapping):
+    """CSS içindeki göreli url(...) referanslarını parmak izli adlara çevirir."""
+    base = os.path.dirname(name)
+
+    def repl(m):
+        ref = m.group(2)
+        if re.match(r'(data:|https?:|/)', ref): return m.group(0)
+        target = os.path.normpath(os.path.join(base, ref.split('?')[0].split('#')[0])).replace(os.sep, '/')
+        if target not in mapping: return m.group(0)
+        return 'url(%s)' % os.path.relpath(mapping[target], base)
+    return re.sub(r'url\((["\']?)([^)"\']+)\1\)', repl, text)
+
+
+def _compress(path, data):
+    written = []
+    with open(path + '.gz', 'wb') as f:
+        f.write(gzip.compress(data, 9, mtime=0))   # mtime=0: aynı girdi aynı çıktıyı versin
+    written.append(path + '.gz')
+    try:
+        import brotli
+    except ImportError:
+        return written
+    with open(path + '.br', 'wb') as f:
+        f.write(brotli.compress(data, quality=11))
+    written.append(path + '.br')
+    return written
+
+
+def build(progress=None):
+    """Tüm kaynakları dist/ altına derler, eski çıktıları siler. Manifesti döndürür."""
+    global _manifest
+    os.makedirs(DIST_DIR, exist_ok=True)
+    names = list(_sources())
+    # CSS en son: içinde başvurduğu font/resimlerin parmak izli adları gerekiyor
+    names.sort(key=lambda n: n.endswith('.css'))
+    mapping, keep = {}, {MANIFEST}
+    for name in names:
+        with open(os.path.join(STATIC_DIR, name), 'rb') as f:
+            data = f.read()
+        if name.endswith('.css'):
+            data = _rewrite_css(name, data.decode('utf-8'), mapping).encode('utf-8')
+        mapping[name] = _fingerprint(name, data)
+        out = os.path.join(DIST_DIR, mapping[name])
+        os.makedirs(os.path.dirname(out), exist_ok=True)
+        if not os.path.exists(out):
+            with open(out, 'wb') as f:
+                f.write(data)
+        keep.add(out)
+        if name.endswith(COMPRESS) and len(data) >= MIN_COMPRESS:
+            keep.update(_compress(out, data))
+        if progress: progress(name, mapping[name])
+    for root, _, files in os.walk(DIST_DIR):
+        for fn in files:
+            path = os.path.join(root, fn)
+            if path not in keep: os.remove(path)
+    with open(MANIFEST, 'w', encoding='utf-8') as f:
+        json.dump(mapping, f, indent=1, sort_keys=True)
+        f.write('\n')
+    _manifest = mapping
+    return mapping
+
+
+# --- İKON ALT KÜMESİ ---
+def used_icons():
+    """Şablonlarda ve static/js'de geçen fa-* sınıfları."""
+    found = set()
+    for folder, ext in ((TEMPLATES_DIR, ('.html', '.js')), (os.path.join(STATIC_DIR, 'js'), ('.js',))):
+        for fn in os.listdir(folder):
+            if fn.endswith(ext):
+                with open(os.path.join(folder, fn), encoding='utf-8') as f:
+                    found.update(re.findall(r'\bfa-[a-z0-9-]+', f.read()))
+    return found
+
+
+def subset_icons(icons=None):
+    """Font Awesome'ın solid fontunu ve CSS'ini sadece kullanılan ikonlara indirger.
+
+    Kaynak PyPI'daki fontawesomefree paketi, alt kümeyi fontTools çıkarır; ikisi de sadece
+    bu komut için gerekir (pip install fontawesomefree fonttools brotli). Çıktı
+    static/vendor/fontawesome/ altına yazılır, ardından `flask assets build` çalıştırılmalı.
+    """
+    try:
+        import fontawesomefree
+        from fontTools import subset
+    except ImportError as e:
+        raise RuntimeError(f"İkon alt kümesi için eksik paket: {e.name} (pip install fontawesomefree fonttools brotli)")
+    icons = set(icons or used_icons())
+    src = os.path.join(os.path.dirname(fontawesomefree.__file__), 'static', 'fontawesomefree')
+    with open(os.path.join(src, 'css', 'all.min.css'), encoding='utf-8') as f:
+        css = f.read()
+    version = re.search(r'Font Awesome Free ([\d.]+)', css).group(1)
+
+    rules, codepoints = [], set()
+    for selectors, cp in re.findall(r'([^{}]+)\{content:"\\([0-9a-f]+)"\}', css):
+        names = [s.strip()[1:-len(':before')] for s in selectors.split(',') if s.strip().endswith(':before')]
+        hit = sorted(n for n in names if n in icons)
+        if hit:
+            rules.append(','.join(f'.{n}:before' for n in hit) + '{content:"\\%s"}' % cp)
+            codepoints.add(int(cp, 16))
+    # fa-3x, fa-fw gibi ikon olmayan yardımcı sınıflar tek başına tanımlı
+    utilities = [m.group(0) for u in sorted(icons - set(FA_BASE))
+                 for m in [re.search(r'(?<=[}/])\.%s\{[^}]*\}' % re.escape(u), css)] if m]
+    missing = sorted(i for i in icons - set(FA_BASE)
+                     if not re.search(r'\.%s(:before|\{)' % re.escape(i), css))
+
+    os.makedirs(FA_DIR, exist_ok=True)
+    options = subset.Options()
+    options.flavor = 'woff2'
+    options.layout_features = []
+    font = subset.load_font(os.path.join(src, 'webfonts', 'fa-solid-900.woff2'), options)
+    subsetter = subset.Subsetter(options)
+    subsetter.populate(unicodes=codepoints)
+    subsetter.subset(font)
+    subset.save_font(font, os.path.join(FA_DIR, 'fa-solid-900.woff2'), options)
+
+    selectors = ','.join('.' + b for b in FA_BASE)
+    with open(os.path.join(FA_DIR, 'fontawesome.css'), 'w', encoding='utf-8') as f:
+        f.write(f'/* Font Awesome Free {version} (alt küme, `flask assets icons` ile üretildi) - '
+                'https://fontawesome.com/license/free (Icons: CC BY 4.0, Fonts: SIL OFL 1.1, Code: MIT) */\n')
+        f.write('@font-face{font-family:"Font Awesome 6 Free";font-style:normal;font-weight:900;'
+                'font-display:block;src:url(fa-solid-900.woff2) format("woff2")}\n')
+        f.write(selectors + '{-moz-osx-font-smoothing:grayscale;-webkit-font-smoothing:antialiased;'
+                'display:var(--fa-display,inline-block);font-style:normal;font-variant:normal;line-height:1;'
+                'text-rendering:auto;font-family:"Font Awesome 6 Free";font-weight:900}\n')
+        for line in utilities + rules:
+            f.write(line + '\n')
+    return version, len(codepoints), missing
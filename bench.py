@@ -0,0 +1,317 @@
+"""Benchmark ve yük araçları.
+
+    python bench.py run                          # sentetik veri + rota başına p50/p99
+    python bench.py run --save base.json         # sonucu kaydet
+    python bench.py run --compare base.json      # p50 eşiği aşan rota varsa çıkış kodu 1
+    python bench.py generate --db bench.db --days 1095 --rows 120000
+    python bench.py hammer --threads 16 --ops 100
+    python bench.py search --foods 1000000       # besin araması: doğruluk kontrolü + sorgu başına p50/p99
+
+Gerçek rotaları Flask test client üzerinden, ayrı bir geçici veritabanında çalıştırır
+(asıl lifeos_new.db'ye dokunmaz).
+"""
+import argparse
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from datetime import date, timedelta
+
+import cache
+import db
+import foods
+
+
+def load_app(path):
+    # app import edilirken şema kontrolü yapar; önce dosya seçilip göçler uygulanmalı
+    db.DB_NAME = path
+    db.migrate()
+    import app as app_module
+    return app_module
+
+
+def login(client):
+    with client.session_transaction() as sess:
+        sess['logged_in'] = True
+    return client
+
+
+# --- SENTETİK VERİ ---
+HAREKETLER = {
+    'Göğüs': [('Bench Press', 60), ('Incline Dumbbell Press', 24), ('Cable Fly', 15)],
+    'Sırt': [('Barbell Row', 55), ('Lat Pulldown', 50), ('Deadlift', 90)],
+    'Bacak': [('Squat', 80), ('Leg Press', 120), ('Romanian Deadlift', 60)],
+    'Omuz': [('Overhead Press', 40), ('Lateral Raise', 10)],
+    'Kol': [('Barbell Curl', 30), ('Triceps Pushdown', 25)],
+    'Karın': [('Cable Crunch', 30), ('Hanging Leg Raise', 0)],
+    'Kardiyo': [('Koşu', 0), ('Bisiklet', 0), ('Kürek', 0)],
+}
+GEN_BATCH = 10000
+
+
+def generate(conn, days=1095, rows=120000, seed=42):
+    """Bugünden geriye `days` günlük, toplam `rows` antrenman satırı ve günlük takviye kayıtları.
+
+    Ağırlıklar zamanla artar (progressive overload), aynı seed aynı veriyi üretir.
+    """
+    rnd = random.Random(seed)
+    today = date.today()
+    sup_ids = [r[0] for r in conn.execute('SELECT id FROM supplements_def')]
+    workouts, logs = [], []
+
+    def flush(final=False):
+        if len(workouts) >= GEN_BATCH or (final and workouts):
+            db.write(lambda c, b: c.executemany(
+                'INSERT INTO workouts (bolge, hareket, set_sayisi, tekrar, agirlik, sure, mesafe, tarih) '
+                'VALUES (?,?,?,?,?,?,?,?)', b), workouts, conn=conn)
+            workouts.clear()
+        if len(logs) >= GEN_BATCH or (final and logs):
+            db.write(lambda c, b: c.executemany(
+                'INSERT OR IGNORE INTO supplement_logs (sup_id, tarih) VALUES (?,?)', b), logs, conn=conn)
+            logs.clear()
+
+    for d in range(days - 1, -1, -1):
+        tarih = (today - timedelta(days=d)).isoformat()
+        progress = 1 + 0.4 * (days - d) / days
+        session = rnd.sample(sorted(HAREKETLER), 2)
+        for _ in range(rows // days + (1 if d < rows % days else 0)):
+            bolge = rnd.choice(session)
+            hareket, base = rnd.choice(HAREKETLER[bolge])
+            if bolge == 'Kardiyo':
+                sure = rnd.randint(15, 60)
+                workouts.append((bolge, hareket, 0, 0, 0, sure, round(sure / rnd.uniform(5, 7), 1), tarih))
+            else:
+                agirlik = round(base * progress * rnd.uniform(0.85, 1.05) / 2.5) * 2.5
+                workouts.append((bolge, hareket, rnd.randint(3, 5), rnd.randint(5, 12), agirlik, 0, 0, tarih))
+        logs.extend((sid, tarih) for sid in sup_ids if rnd.random() < 0.7)
+        flush()
+    flush(final=True)
+
+
+def generate_command(args):
+    load_app(args.db)
+    conn = db.connect()
+    t0 = time.perf_counter()
+    generate(conn, args.days, args.rows, args.seed)
+    n = conn.execute('SELECT count(*) FROM workouts').fetchone()[0]
+    print(f"{args.db}: {n} antrenman satırı ({time.perf_counter() - t0:.1f}s)")
+    return 0
+
+
+# --- ROTA BENCHMARK ---
+def percentile(xs, p):
+    xs = sorted(xs)
+    return xs[min(len(xs) - 1, int(round(p * (len(xs) - 1))))]
+
+
+def scenarios(app_module, conn):
+    """(ad, istek fonksiyonu) listesi. Her fonksiyon test client alır, Response döndürür."""
+    sup_id = conn.execute('SELECT id FROM supplements_def ORDER BY id LIMIT 1').fetchone()[0]
+    n = conn.execute('SELECT count(*) FROM workouts').fetchone()[0]
+    mid = conn.execute('SELECT tarih, id FROM workouts ORDER BY tarih DESC, id DESC LIMIT 1 OFFSET ?', (n // 2,)).fetchone()
+    deep = f"{mid['tarih']}_{mid['id']}" if mid else ''
+    json_h = {'Accept': 'application/json'}
+
+    def uncached(path):
+        def run(c):
+            cache.render_cache.clear()
+            return c.get(path)
+        return run
+
+    def revalidate(path):
+        etag = {}
+        def run(c):
+            if path not in etag: etag[path] = c.get(path).headers.get('ETag', '')
+            return c.get(path, headers={'If-None-Match': etag[path]})
+        return run
+
+    return [
+        ('GET / (uncached)', uncached('/')),
+        ('GET /fitness (uncached)', uncached('/fitness')),
+        ('GET /analysis (uncached)', uncached('/analysis')),
+        ('GET /api/analytics (cold)', lambda c: (app_module.analytics._memo.clear(), uncached('/api/analytics')(c))[1]),
+        ('GET /api/analytics (memoized)', uncached('/api/analytics')),
+        ('GET /fitness (cached)', lambda c: c.get('/fitness')),
+        ('GET /fitness (304)', revalidate('/fitness')),
+        ('GET /api/workouts', lambda c: c.get('/api/workouts')),
+        ('GET /api/workouts (deep cursor)', lambda c: c.get(f'/api/workouts?cursor={deep}')),
+        ('POST add_workout (json)', lambda c: c.post('/fitness', headers=json_h, data={
+            'add_workout': '1', 'bolge': 'Göğüs', 'hareket': 'Bench Press', 'sets': 4, 'tekrar': 8, 'agirlik': 80})),
+        ('POST toggle_sup (json)', lambda c: c.post('/fitness', headers=json_h, data={'toggle_sup': '1', 'sup_id': sup_id})),
+    ]
+
+
+def run_command(args):
+    app_module = load_app(args.db)
+    conn = db.connect()
+    if conn.execute('SELECT count(*) FROM workouts').fetchone()[0] == 0:
+        print(f"Sentetik veri üretiliyor ({args.days} gün, {args.rows} satır)...")
+        generate(conn, args.days, args.rows, args.seed)
+    client = login(app_module.app.test_client())
+
+    results = {}
+    print(f"{'rota':34} {'p50 ms':>9} {'p99 ms':>9}")
+    for name, fn in scenarios(app_module, conn):
+        for _ in range(args.warmup): fn(client)
+        times = []
+        for _ in range(args.iterations):
+            t0 = time.perf_counter()
+            res = fn(client)
+            times.append((time.perf_counter() - t0) * 1000)
+            if res.status_code >= 400: raise SystemExit(f"{name}: HTTP {res.status_code}")
+        results[name] = {'p50': percentile(times, 0.5), 'p99': percentile(times, 0.99)}
+        print(f"{name:34} {results[name]['p50']:9.2f} {results[name]['p99']:9.2f}")
+
+    if args.save:
+        with open(args.save, 'w') as f: json.dump(results, f, indent=2, ensure_ascii=False)
+    if args.compare:
+        with open(args.compare) as f: base = json.load(f)
+        slow = [(k, base[k]['p50'], v['p50']) for k, v in results.items()
+                if k in base and v['p50'] > base[k]['p50'] * args.threshold]
+        for k, old, new in slow: print(f"GERİLEME: {k} p50 {old:.2f} -> {new:.2f} ms")
+        return 1 if slow else 0
+    return 0
+
+
+# --- BESİN ARAMASI ---
+FOOD_WORDS = ('süt', 'sütlü', 'çikolata', 'çikolatalı', 'içecek', 'pınar', 'ülker', 'peynir', 'yoğurt', 'ayran',
+              'ekmek', 'makarna', 'kahve', 'sucuk', 'bisküvi', 'gofret', 'meyve', 'suyu', 'portakal', 'domates',
+              'salça', 'zeytin', 'yağ', 'tam', 'yağlı', 'light', 'laktozsuz', 'ızgara', 'şeftali', 'ıhlamur')
+# (arama, bulunması gereken ürün): mobil klavyeler ilk harfi büyük yazar, İ/I Türkçe'de ayrı harfler
+FOOD_CHECKS = [('İçim Kefir', 'İçim Kefir Sade'), ('İÇİM KEFİR', 'İçim Kefir Sade'), ('içim kefir', 'İçim Kefir Sade'),
+               ('Işıklı Tahin', 'Işıklı Tahin Helva'), ('Şölen Ozmo', 'Şölen Ozmo Burger')]
+FOOD_QUERIES = ('sü', 'süt', 'Süt', 'çikolatalı', 'Pınar süt', 'İçecek', 'yağlı peynir')
+
+
+def generate_foods(conn, rows, seed=42):
+    """Rastgele isimli `rows` ürün; FOOD_CHECKS'in beklediği ürünler en sona eklenir."""
+    rnd = random.Random(seed)
+    batch = []
+    for i in range(rows):
+        name = ' '.join(rnd.choice(FOOD_WORDS) for _ in range(rnd.randint(2, 5))).title()
+        batch.append((str(2000000000000 + i), name, rnd.choice(FOOD_WORDS).title(), 100, 5, 5, 10))
+        if len(batch) >= GEN_BATCH:
+            db.write(foods._insert_batch, batch, conn=conn)
+            batch = []
+    batch += [(str(2900000000000 + i), name, None, 100, 5, 5, 10) for i, (_, name) in enumerate(FOOD_CHECKS)]
+    db.write(foods._insert_batch, batch, conn=conn)
+    conn.execute("INSERT INTO foods_fts (foods_fts) VALUES ('optimize')")
+
+
+def search_command(args):
+    load_app(args.db)
+    conn = db.connect()
+    if conn.execute('SELECT count(*) FROM foods').fetchone()[0] == 0:
+        print(f"Sentetik katalog üretiliyor ({args.foods} ürün)...")
+        generate_foods(conn, args.foods, args.seed)
+
+    failed = []
+    for q, expected in FOOD_CHECKS:
+        names = [r['name'] for r in foods.search(conn, q)]
+        if expected not in names: failed.append((q, expected, names[:3]))
+
+    print(f"{'sorgu':34} {'p50 ms':>9} {'p99 ms':>9}")
+    for q in FOOD_QUERIES:
+        q = foods.normalize_query(q)
+        times = []
+        for _ in range(args.iterations):
+            t0 = time.perf_counter()
+            foods.search_text(conn, q)   # önbelleği atlar
+            times.append((time.perf_counter() - t0) * 1000)
+        print(f"{q:34} {percentile(times, 0.5):9.2f} {percentile(times, 0.99):9.2f}")
+
+    for q, expected, got in failed: print(f"BULUNAMADI: {q!r} -> {expected!r} (ilk sonuçlar: {got})")
+    print("OK" if not failed else "BAŞARISIZ")
+    return 1 if failed else 0
+
+
+# --- HAMMER: toggle_sup + add_workout eşzamanlı yazma testi ---
+def hammer(args):
+    app_module = load_app(args.db)
+    app = app_module.app
+    conn = db.connect()
+    sup_id = conn.execute('SELECT id FROM supplements_def ORDER BY id LIMIT 1').fetchone()[0]
+    before = conn.execute('SELECT count(*) FROM workouts').fetchone()[0]
+    had_sup = conn.execute("SELECT count(*) FROM supplement_logs WHERE sup_id=? AND tarih=date('now', 'localtime')", (sup_id,)).fetchone()[0]
+
+    errors, lock = [], threading.Lock()
+    start = threading.Barrier(args.threads)
+
+    def worker(n):
+        client = login(app.test_client())
+        start.wait()
+        for i in range(args.ops):
+            if i % 2:
+                data = {'toggle_sup': '1', 'sup_id': sup_id}
+            else:
+                data = {'add_workout': '1', 'bolge': 'Göğüs', 'hareket': f'Hammer {n}', 'sets': 3, 'tekrar': 10, 'agirlik': 50}
+            res = client.post('/fitness', data=data)
+            with client.session_transaction() as sess:
+                failed = [m for c, m in sess.pop('_flashes', []) if c == 'danger']
+            if res.status_code != 302 or failed:
+                with lock: errors.append((n, i, res.status_code, failed))
+
+    threads = [threading.Thread(target=worker, args=(n,)) for n in range(args.threads)]
+    t0 = time.perf_counter()
+    for t in threads: t.start()
+    for t in threads: t.join()
+    elapsed = time.perf_counter() - t0
+
+    adds = args.threads * ((args.ops + 1) // 2)
+    toggles = args.threads * (args.ops // 2)
+    added = conn.execute('SELECT count(*) FROM workouts').fetchone()[0] - before
+    has_sup = conn.execute("SELECT count(*) FROM supplement_logs WHERE sup_id=? AND tarih=date('now', 'localtime')", (sup_id,)).fetchone()[0]
+    expected_sup = (had_sup + toggles) % 2
+
+    total = args.threads * args.ops
+    print(f"{total} istek, {args.threads} thread, {elapsed:.2f}s ({total / elapsed:.0f} istek/s)")
+    print(f"workouts: +{added} (beklenen {adds}), supplement log: {has_sup} (beklenen {expected_sup})")
+    for e in errors[:10]: print("HATA:", e)
+    ok = not errors and added == adds and has_sup == expected_sup
+    print("OK" if ok else "BAŞARISIZ")
+    return 0 if ok else 1
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--db', default=None, help='varsayılan: geçici dizinde yeni bir dosya')
+    sub = parser.add_subparsers(dest='cmd', required=True)
+
+    def data_args(p):
+        p.add_argument('--days', type=int, default=1095, help='geçmiş uzunluğu (gün)')
+        p.add_argument('--rows', type=int, default=120000, help='toplam antrenman satırı')
+        p.add_argument('--seed', type=int, default=42)
+
+    p = sub.add_parser('generate', help='sentetik geçmiş üret')
+    data_args(p)
+    p.set_defaults(func=generate_command)
+
+    p = sub.add_parser('run', help='rotaları test client ile ölç (p50/p99)')
+    data_args(p)
+    p.add_argument('--iterations', type=int, default=200)
+    p.add_argument('--warmup', type=int, default=10)
+    p.add_argument('--save', help='sonucu JSON olarak kaydet')
+    p.add_argument('--compare', help='önceki JSON sonucuyla karşılaştır')
+    p.add_argument('--threshold', type=float, default=1.25, help='p50 bu oranı aşarsa gerileme say')
+    p.set_defaults(func=run_command)
+
+    p = sub.add_parser('search', help='besin araması: Türkçe büyük harf kontrolü ve sorgu süreleri')
+    p.add_argument('--foods', type=int, default=200000, help='katalog boyutu (boşsa üretilir)')
+    p.add_argument('--iterations', type=int, default=20)
+    p.add_argument('--seed', type=int, default=42)
+    p.set_defaults(func=search_command)
+
+    p = sub.add_parser('hammer', help='toggle_sup ve add_workout yollarını çok thread ile döv')
+    p.add_argument('--threads', type=int, default=16)
+    p.add_argument('--ops', type=int, default=100, help='thread başına istek')
+    p.set_defaults(func=hammer)
+    args = parser.parse_args(argv)
+    args.db = args.db or os.path.join(tempfile.mkdtemp(prefix='lifeos-bench-'), 'bench.db')
+    return args.func(args)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
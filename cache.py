@@ -0,0 +1,106 @@
+"""Süreç içi önbellekler ve veri sürümüne bağlı ETag / render önbelleği.
+
+Veri sürümü DB'deki data_version sayacıdır (migrations/0005_data_version.sql); kullanıcı
+tablolarına her yazma onu artırır. Bu yüzden her worker'ın kendi önbelleği olsa da
+anahtar sürümü içerdiği için bayat sayfa servis edilmez.
+"""
+import glob
+import hashlib
+import os
+import threading
+import time
+from collections import OrderedDict
+from datetime import datetime
+from functools import wraps
+from flask import request, session, make_response
+
+import db
+
+RENDER_CACHE_SIZE = 64
+# Önbellekten dönen yanıta taşınmayan başlıklar: oturum çerezi isteğe özel, uzunluk yeniden hesaplanır
+UNCACHED_HEADERS = {'set-cookie', 'content-length'}
+
+
+class LRUCache:
+    """Süreç içi, thread-safe LRU; ttl verilirse girdiler o kadar saniye sonra bayatlar."""
+
+    def __init__(self, size, ttl=None):
+        self.size, self.ttl = size, ttl
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            hit = self._data.get(key)
+            if hit is None: return None
+            if hit[0] is not None and hit[0] < time.monotonic():
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return hit[1]
+
+    def put(self, key, value):
+        with self._lock:
+            self._data[key] = (time.monotonic() + self.ttl if self.ttl else None, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.size:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+def _build_version():
+    """Şablon ve kod dosyalarının özeti: deploy değişince ETag'ler de değişir, worker'lar arasında aynıdır.
+
+    Statik manifest de dahil: sayfalar parmak izli dosya adlarını içeriyor.
+    """
+    h = hashlib.sha1()
+    files = glob.glob(os.path.join(db.BASE_DIR, '*.py')) + glob.glob(os.path.join(db.BASE_DIR, 'templates', '*.html'))
+    files += glob.glob(os.path.join(db.BASE_DIR, 'static', 'dist', 'manifest.json'))
+    for path in sorted(files):
+        with open(path, 'rb') as f:
+            h.update(f.read())
+    return h.hexdigest()[:10]
+
+
+BUILD_VERSION = _build_version()
+render_cache = LRUCache(RENDER_CACHE_SIZE)
+
+
+def data_version(conn=None):
+    row = (conn or db.get_db()).execute('SELECT version FROM data_version WHERE id = 1').fetchone()
+    return row[0] if row else 0
+
+
+def versioned(view):
+    """GET yanıtlarına veri sürümünden türetilmiş güçlü ETag ekler, eşleşirse 304 döner.
+
+    Render edilen sayfa (endpoint, ETag) anahtarıyla saklanır; aynı sürümde başka bir istemci
+    geldiğinde sorgu ve şablon çalışmaz. Sayfa güne bağlı (Bugün/Dün, takvim, 30 gün) olduğu
+    için tarih de anahtarın parçası. Bekleyen flash mesajı varsa önbellek atlanır.
+    """
+    @wraps(view)
+    def decorated(*args, **kwargs):
+        if request.method not in ('GET', 'HEAD') or session.get('_flashes'):
+            return view(*args, **kwargs)
+        etag = f"{BUILD_VERSION}-{data_version()}-{datetime.now():%Y%m%d}"
+        if etag in request.if_none_match:
+            resp = make_response('', 304)
+        else:
+            key = (request.endpoint, request.full_path, etag)
+            hit = render_cache.get(key)
+            if hit is None:
+                resp = make_response(view(*args, **kwargs))
+                if resp.status_code != 200: return resp
+                # Gövdeyle birlikte başlıklar da (Content-Type vb.) saklanır: JSON rotaları JSON olarak dönsün
+                headers = [(k, v) for k, v in resp.headers if k.lower() not in UNCACHED_HEADERS]
+                render_cache.put(key, (resp.get_data(), headers))
+            else:
+                resp = make_response(hit[0], 200, hit[1])
+        resp.set_etag(etag)
+        # Tarayıcı saklayabilir ama her seferinde ETag ile sormalı
+        resp.headers['Cache-Control'] = 'private, no-cache'
+        return resp
+    return decorated
@@ -0,0 +1,163 @@
+import glob
+import os
+import random
+import sqlite3
+import threading
+import time
+from flask import g
+
+from metrics import InstrumentedConnection
+
+BASE_DIR = os.path.abspath(os.path.dirname(__file__))
+
+# Eski bozuk dosya yerine tertemiz bir dosya açar. DB_PATH ile (bench, deneme) başka dosya seçilebilir.
+DB_NAME = os.environ.get('DB_PATH') or os.path.join(BASE_DIR, "lifeos_new.db")
+MIGRATIONS_DIR = os.path.join(BASE_DIR, 'migrations')
+
+# --- AYARLAR ---
+BUSY_TIMEOUT = 5000                # ms, kilitte hemen hata verme, bekle
+# WAL: okuyucular yazanı beklemez. NORMAL senkron WAL ile güvenli ve çok daha hızlı.
+PRAGMAS = (
+    ('journal_mode', 'WAL'),
+    ('synchronous', 'NORMAL'),
+    ('busy_timeout', BUSY_TIMEOUT),
+    ('cache_size', -16000),        # ~16 MB sayfa önbelleği (negatif = KiB)
+    ('mmap_size', 256 * 1024 * 1024),
+    ('temp_store', 'MEMORY'),
+)
+STATEMENT_CACHE = 256              # bağlantı başına hazır (prepared) sorgu önbelleği
+WRITE_RETRIES = 6
+WRITE_BACKOFF = 0.02               # sn, her denemede ikiye katlanır (+ jitter)
+
+_local = threading.local()
+
+
+def connect(path=None):
+    """Ayarları yapılmış yeni bir bağlantı. Transaction'ları write() yönetir (autocommit modu)."""
+    conn = sqlite3.connect(path or DB_NAME, timeout=BUSY_TIMEOUT / 1000, factory=InstrumentedConnection,
+                           isolation_level=None, cached_statements=STATEMENT_CACHE)
+    conn.row_factory = sqlite3.Row
+    for name, value in PRAGMAS:
+        conn.execute(f'PRAGMA {name}={value}')
+    return conn
+
+
+def pooled_connection():
+    """Thread (ve worker) başına tek bağlantı; her istekte yeniden connect maliyeti yok."""
+    conn = getattr(_local, 'conn', None)
+    # fork sonrası miras kalan bağlantı kullanılmaz (gunicorn --preload)
+    if conn is None or _local.pid != os.getpid() or _local.path != DB_NAME:
+        conn = connect()
+        _local.conn, _local.pid, _local.path = conn, os.getpid(), DB_NAME
+    return conn
+
+
+def get_db():
+    """App context'e bağlı bağlantı. İstek bitince teardown havuza geri bırakır."""
+    if 'db' not in g:
+        g.db = pooled_connection()
+    return g.db
+
+
+def release_db(exc=None):
+    conn = g.pop('db', None)
+    # Yarım kalan transaction bir sonraki isteğe sızmasın
+    if conn is not None and conn.in_transaction:
+        conn.rollback()
+
+
+def init_app(app):
+    app.teardown_appcontext(release_db)
+
+
+def _is_busy(e):
+    msg = str(e).lower()
+    return 'locked' in msg or 'busy' in msg
+
+
+def write(fn, *args, conn=None):
+    """fn(conn, *args) tek bir BEGIN IMMEDIATE transaction'ında çalışır.
+
+    Kilit hatasında geri alınır ve üstel bekleme ile tekrar denenir; fn bu yüzden
+    yan etkisiz (flash vb. yok) olmalı, sonucunu döndürmeli.
+    """
+    conn = conn or get_db()
+    delay = WRITE_BACKOFF
+    for attempt in range(WRITE_RETRIES):
+        try:
+            conn.execute('BEGIN IMMEDIATE')
+            result = fn(conn, *args)
+            conn.execute('COMMIT')
+            return result
+        except sqlite3.OperationalError as e:
+            if conn.in_transaction: conn.rollback()
+            if not _is_busy(e) or attempt == WRITE_RETRIES - 1: raise
+            time.sleep(delay * (1 + random.random()))
+            delay *= 2
+        except BaseException:
+            if conn.in_transaction: conn.rollback()
+            raise
+
+
+# --- ŞEMA GÖÇLERİ ---
+# migrations/NNNN_ad.sql dosyaları sırayla, her biri kendi transaction'ında uygulanır.
+# Uygulananlar schema_migrations tablosunda tutulur. Worker'lar DDL çalıştırmaz: `flask --app app migrate`.
+
+def migration_files():
+    files = []
+    for path in sorted(glob.glob(os.path.join(MIGRATIONS_DIR, '[0-9]*.sql'))):
+        name = os.path.basename(path)
+        files.append((int(name.split('_', 1)[0]), name, path))
+    return files
+
+
+def _ensure_version_table(conn):
+    conn.execute('CREATE TABLE IF NOT EXISTS schema_migrations (version INTEGER PRIMARY KEY, name TEXT, applied_at TEXT)')
+
+
+def applied_versions(conn):
+    try:
+        return {r[0] for r in conn.execute('SELECT version FROM schema_migrations')}
+    except sqlite3.OperationalError:  # tablo yok = hiç göç uygulanmamış
+        return set()
+
+
+def pending_migrations(conn):
+    done = applied_versions(conn)
+    return [m for m in migration_files() if m[0] not in done]
+
+
+def _statements(sql):
+    # executescript() açık transaction'ı commit ettiği için ifadeler tek tek çalıştırılır
+    buf = ''
+    for line in sql.splitlines(keepends=True):
+        buf += line
+        if sqlite3.complete_statement(buf):
+            yield buf
+            buf = ''
+    if buf.strip():
+        yield buf
+
+
+def migrate(conn=None):
+    """Bekleyen göçleri uygular, uygulananların adlarını döndürür."""
+    conn = conn or connect()
+    _ensure_version_table(conn)
+    applied = []
+    for version, name, path in migration_files():
+        with open(path, encoding='utf-8') as f:
+            sql = f.read()
+
+        def apply(conn):
+            # Aynı anda başka süreç de migrate ediyorsa kilidi aldıktan sonra tekrar bak
+            if conn.execute('SELECT 1 FROM schema_migrations WHERE version=?', (version,)).fetchone():
+                return False
+            for stmt in _statements(sql):
+                conn.execute(stmt)
+            conn.execute("INSERT INTO schema_migrations (version, name, applied_at) VALUES (?, ?, datetime('now'))",
+                         (version, name))
+            return True
+
+        if version not in applied_versions(conn) and write(apply, conn=conn):
+            applied.append(name)
+    return applied
@@ -0,0 +1,190 @@
+"""Yerel besin kataloğu: arama, barkod, önbellek ve toplu yükleme (migrations/0004_foods.sql)."""
+import csv
+import gzip
+import io
+import json
+import re
+import unicodedata
+
+import db
+from cache import LRUCache
+
+SEARCH_LIMIT = 20
+RANK_CANDIDATES = 5000  # bm25 en fazla bu kadar eşleşmede hesaplanır (1M üründe ~20-50 ms, bench.py search)
+CACHE_SIZE = 2048
+CACHE_TTL = 300          # sn; katalog nadiren (toplu yüklemeyle) değişir
+LOAD_BATCH = 5000
+COLUMNS = ('barcode', 'name', 'brand', 'cal', 'pro', 'fat', 'carb')
+
+# Dökümdeki olası kolon adları (kendi CSV'miz + OpenFoodFacts)
+FIELD_ALIASES = {
+    'barcode': ('barcode', 'code', 'ean'),
+    'name': ('name', 'product_name', 'product_name_tr', 'product_name_en'),
+    'brand': ('brand', 'brands'),
+    'cal': ('cal', 'energy-kcal_100g', 'energy-kcal'),
+    'pro': ('pro', 'proteins_100g', 'proteins'),
+    'fat': ('fat', 'fat_100g'),
+    'carb': ('carb', 'carbohydrates_100g', 'carbohydrates'),
+}
+
+
+# --- ÖNBELLEK ---
+cache = LRUCache(CACHE_SIZE, ttl=CACHE_TTL)
+
+
+# --- ARAMA ---
+def _row(r):
+    return {'barcode': r['barcode'], 'name': r['name'], 'brand': r['brand'] or '',
+            'cal': r['cal'] or 0, 'pro': r['pro'] or 0, 'fat': r['fat'] or 0, 'carb': r['carb'] or 0}
+
+
+def normalize_query(q):
+    """Küçük harf, birleşik işaretler atılmış hâl. 'İ'.lower() 'i' + U+0307 verir; nokta kalırsa
+    \w+ kelimeyi ikiye böler ('İçim' -> 'i', 'çim'). FTS zaten remove_diacritics ile aksansız indeksler.
+    """
+    q = unicodedata.normalize('NFKD', q.lower())
+    return ' '.join(''.join(c for c in q if unicodedata.category(c) != 'Mn').split())
+
+
+def fts_query(q):
+    """'nes kah' -> '"nes"* AND "kah"*' (her kelime önek olarak, FTS sözdizimi kaçırılmış).
+
+    Tek harfli kelimeler atlanır: önek indeksi 2 harften başlar, tek harf tüm tabloyu tarar.
+    """
+    tokens = [t for t in re.findall(r'\w+', q) if len(t) >= 2]
+    return ' AND '.join('"%s"*' % t for t in tokens)
+
+
+def normalize_barcode(code):
+    """Barkodun tek biçimi: UPC-A (12), EAN-13 ve başı 0'lı GTIN-14 aynı ürünü 13 haneyle gösterir.
+
+    Yüklemede ve aramada aynı fonksiyon kullanılır (migrations/0007 eski kayıtları da çevirir).
+    """
+    digits = re.sub(r'\D', '', str(code or ''))
+    if not digits: return None
+    core = digits.lstrip('0')
+    return core.zfill(13) if len(core) <= 13 else digits
+
+
+def barcode_candidates(code):
+    # Ham hâl de aranır: normalleştirmede UNIQUE çakışması yüzünden eski biçimde kalmış kayıtlar için
+    digits = re.sub(r'\D', '', code)
+    if not digits: return []
+    return list(dict.fromkeys([normalize_barcode(digits), digits]))
+
+
+def search_text(conn, q, limit=SEARCH_LIMIT):
+    """bm25'e göre en iyi `limit` ürün.
+
+    RANK_CANDIDATES'tan az eşleşen sorgularda sıralama tam. Daha geniş sorgularda ('sü', 'süt'
+    gibi kısa önekler 100 binlerce satır eşler) sadece rowid sırasındaki ilk RANK_CANDIDATES
+    eşleşme sıralanır, alaka bilerek feda edilir: hepsini sıralamak 1M üründe saniyeyi buluyor.
+    Yazdıkça sorgu daralır ve tam sıralamaya düşer.
+    """
+    match = fts_query(q)
+    if not match: return []
+    rows = conn.execute('SELECT f.* FROM (SELECT rowid, rank FROM foods_fts WHERE foods_fts MATCH ? LIMIT ?) m '
+                        'JOIN foods f ON f.id = m.rowid ORDER BY m.rank LIMIT ?',
+                        (match, RANK_CANDIDATES, limit)).fetchall()
+    return [_row(r) for r in rows]
+
+
+def search_barcode(conn, code):
+    codes = barcode_candidates(code)
+    if not codes: return []
+    rows = conn.execute(f"SELECT * FROM foods WHERE barcode IN ({','.join('?' * len(codes))})", codes).fetchall()
+    return [_row(r) for r in rows]
+
+
+def search(conn, q, kind='text'):
+    q = normalize_query(q)
+    key = (kind, q)
+    hit = cache.get(key)
+    if hit is not None: return hit
+    result = search_barcode(conn, q) if kind == 'barcode' else search_text(conn, q)
+    cache.put(key, result)
+    return result
+
+
+# --- TOPLU YÜKLEME ---
+def _open(path):
+    if path.endswith('.gz'):
+        return io.TextIOWrapper(gzip.open(path, 'rb'), encoding='utf-8', errors='replace', newline='')
+    return open(path, encoding='utf-8', errors='replace', newline='')
+
+
+def _pick(rec, field):
+    nutriments = rec.get('nutriments') if isinstance(rec.get('nutriments'), dict) else {}
+    for alias in FIELD_ALIASES[field]:
+        for source in (rec, nutriments):
+            value = source.get(alias)
+            if value not in (None, ''): return value
+    return None
+
+
+def _num(value):
+    try:
+        return round(float(value), 2)
+    except (TypeError, ValueError):
+        return None
+
+
+def to_product(rec):
+    """Döküm kaydını katalog satırına çevirir; isimsiz kayıtlar atlanır (None)."""
+    name = _pick(rec, 'name')
+    if not name: return None
+    barcode = normalize_barcode(_pick(rec, 'barcode'))
+    brand = _pick(rec, 'brand')
+    if isinstance(brand, list): brand = ', '.join(brand)
+    return (barcode, str(name).strip(), (str(brand).split(',')[0].strip() if brand else None),
+            _num(_pick(rec, 'cal')), _num(_pick(rec, 'pro')), _num(_pick(rec, 'fat')), _num(_pick(rec, 'carb')))
+
+
+def read_records(path, delimiter=None):
+    """CSV/TSV/JSONL (.gz olabilir) dökümü satır satır okur; dosya belleğe alınmaz."""
+    f = _open(path)
+    with f:
+        base = path[:-3] if path.endswith('.gz') else path
+        if base.endswith(('.jsonl', '.ndjson', '.json')):
+            for line in f:
+                line = line.strip()
+                if line: yield json.loads(line)
+        else:
+            csv.field_size_limit(1 << 24)
+            delimiter = delimiter or ('\t' if base.endswith(('.tsv', '.tab')) else ',')
+            yield from csv.DictReader(f, delimiter=delimiter)
+
+
+def _insert_batch(conn, batch):
+    conn.executemany(
+        f"INSERT INTO foods ({', '.join(COLUMNS)}) VALUES ({', '.join('?' * len(COLUMNS))}) "
+        "ON CONFLICT (barcode) DO UPDATE SET name=excluded.name, brand=excluded.brand, "
+        "cal=excluded.cal, pro=excluded.pro, fat=excluded.fat, carb=excluded.carb", batch)
+
+
+def load(path, batch_size=LOAD_BATCH, delimiter=None, conn=None, progress=None):
+    """Dökümü batch_size'lık transaction'larla yükler. Bellek kullanımı batch boyutuyla sınırlı.
+
+    Aynı barkod tekrar gelirse kayıt güncellenir. (yüklenen, atlanan) döndürür.
+    """
+    conn = conn or db.connect()
+    loaded = skipped = 0
+    batch = []
+    for rec in read_records(path, delimiter):
+        product = to_product(rec)
+        if product is None:
+            skipped += 1
+            continue
+        batch.append(product)
+        if len(batch) >= batch_size:
+            db.write(_insert_batch, batch, conn=conn)
+            loaded += len(batch)
+            batch = []
+            if progress: progress(loaded, skipped)
+    if batch:
+        db.write(_insert_batch, batch, conn=conn)
+        loaded += len(batch)
+    # Çok sayıda küçük FTS segmentini birleştir: sonraki aramalar daha az segment tarar
+    conn.execute("INSERT INTO foods_fts (foods_fts) VALUES ('optimize')")
+    cache.clear()
+    return loaded, skipped
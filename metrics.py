@@ -0,0 +1,169 @@
+"""İstek / SQL / şablon / auth ölçümleri ve Prometheus metin formatında /metrics çıktısı.
+
+Ölçümler süreç (worker) başınadır; gunicorn'da her scrape bir worker'ın sayılarını görür,
+bu yüzden her seriye pid etiketi eklenir.
+"""
+import os
+import sqlite3
+import threading
+import time
+from bisect import bisect_left
+from functools import wraps
+from flask import g, has_app_context, request, template_rendered, before_render_template
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5)
+COUNT_BUCKETS = (0, 1, 2, 5, 10, 20, 50, 100)
+
+_lock = threading.Lock()
+_histograms = {}   # ad -> Histogram
+_counters = {}     # (ad, etiketler) -> sayı
+HELP = {
+    'lifeos_request_seconds': 'İstek süresi (route, method, status).',
+    'lifeos_request_sql_statements': 'İstek başına SQL ifadesi sayısı.',
+    'lifeos_request_sql_seconds': 'İstek başına toplam SQL süresi.',
+    'lifeos_sql_statements_total': 'Çalıştırılan SQL ifadeleri.',
+    'lifeos_template_render_seconds': 'Şablon render süresi.',
+    'lifeos_auth_check_seconds': 'check_auth süresi.',
+}
+
+
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.series = {}  # etiketler -> [kova sayıları..., toplam, adet]
+
+    def observe(self, value, labels=()):
+        s = self.series.get(labels)
+        if s is None:
+            s = self.series[labels] = [0] * (len(self.buckets) + 2)
+        i = bisect_left(self.buckets, value)  # value <= buckets[i]; hiçbirine sığmazsa sadece +Inf
+        if i < len(self.buckets): s[i] += 1
+        s[-2] += value
+        s[-1] += 1
+
+
+def observe(name, value, labels=(), buckets=LATENCY_BUCKETS):
+    with _lock:
+        h = _histograms.get(name)
+        if h is None:
+            h = _histograms[name] = Histogram(buckets)
+        h.observe(value, labels)
+
+
+def inc(name, labels=(), value=1):
+    with _lock:
+        _counters[(name, labels)] = _counters.get((name, labels), 0) + value
+
+
+def reset():
+    with _lock:
+        _histograms.clear()
+        _counters.clear()
+
+
+def timed(name, labels=()):
+    """Fonksiyon süresini histograma yazan dekoratör."""
+    def wrap(fn):
+        @wraps(fn)
+        def inner(*args, **kwargs):
+            t0 = time.perf_counter()
+            try:
+                return fn(*args, **kwargs)
+            finally:
+                observe(name, time.perf_counter() - t0, labels)
+        return inner
+    return wrap
+
+
+# --- SQL ---
+class InstrumentedConnection(sqlite3.Connection):
+    """execute/executemany süresini ve sayısını isteğe (g) ve sayaçlara yazar.
+
+    Süre ilk adımı (sonuçların ilk satırı) kapsar; fetchall ile okunan kalan satırlar dahil değil.
+    """
+
+    def _record(self, t0):
+        elapsed = time.perf_counter() - t0
+        inc('lifeos_sql_statements_total')
+        if has_app_context():
+            g.sql_count = g.get('sql_count', 0) + 1
+            g.sql_time = g.get('sql_time', 0.0) + elapsed
+
+    def execute(self, *args):
+        t0 = time.perf_counter()
+        try:
+            return super().execute(*args)
+        finally:
+            self._record(t0)
+
+    def executemany(self, *args):
+        t0 = time.perf_counter()
+        try:
+            return super().executemany(*args)
+        finally:
+            self._record(t0)
+
+
+# --- FLASK KANCALARI ---
+def _before_request():
+    g.request_start = time.perf_counter()
+    g.sql_count, g.sql_time = 0, 0.0
+
+
+def _after_request(response):
+    start = g.get('request_start')
+    if start is not None and request.path != '/metrics':
+        route = request.url_rule.rule if request.url_rule else 'unmatched'
+        observe('lifeos_request_seconds', time.perf_counter() - start,
+                (('route', route), ('method', request.method), ('status', str(response.status_code))))
+        observe('lifeos_request_sql_statements', g.sql_count, (('route', route),), COUNT_BUCKETS)
+        observe('lifeos_request_sql_seconds', g.sql_time, (('route', route),))
+    return response
+
+
+def _before_render(sender, template, context, **extra):
+    g.setdefault('render_start', {})[template.name] = time.perf_counter()
+
+
+def _rendered(sender, template, context, **extra):
+    start = g.get('render_start', {}).pop(template.name, None)
+    if start is not None:
+        observe('lifeos_template_render_seconds', time.perf_counter() - start, (('template', template.name),))
+
+
+def init_app(app):
+    app.before_request(_before_request)
+    app.after_request(_after_request)
+    before_render_template.connect(_before_render, app)
+    template_rendered.connect(_rendered, app)
+
+
+# --- ÇIKTI ---
+def _fmt_labels(labels):
+    labels = (('pid', str(os.getpid())),) + tuple(labels)
+    return '{' + ','.join('%s="%s"' % (k, str(v).replace('\\', '\\\\').replace('"', '\\"')) for k, v in labels) + '}'
+
+
+def render():
+    """Prometheus text exposition formatı (0.0.4)."""
+    out = []
+    with _lock:
+        for name, h in sorted(_histograms.items()):
+            out.append(f'# HELP {name} {HELP.get(name, name)}')
+            out.append(f'# TYPE {name} histogram')
+            for labels, s in sorted(h.series.items()):
+                cumulative = 0
+                for bound, n in zip(h.buckets, s):
+                    cumulative += n
+                    out.append(f'{name}_bucket{_fmt_labels(labels + (("le", repr(float(bound))),))} {cumulative}')
+                out.append(f'{name}_bucket{_fmt_labels(labels + (("le", "+Inf"),))} {s[-1]}')
+                out.append(f'{name}_sum{_fmt_labels(labels)} {s[-2]:.6f}')
+                out.append(f'{name}_count{_fmt_labels(labels)} {s[-1]}')
+        seen = set()
+        for (name, labels), value in sorted(_counters.items()):
+            if name not in seen:
+                out.append(f'# HELP {name} {HELP.get(name, name)}')
+                out.append(f'# TYPE {name} counter')
+                seen.add(name)
+            out.append(f'{name}{_fmt_labels(labels)} {value}')
+    return '\n'.join(out) + '\n'
@@ -0,0 +1,17 @@
+-- İlk şema: eski init_db() ile aynı. IF NOT EXISTS sayesinde mevcut veritabanları da bu sürüme oturur.
+CREATE TABLE IF NOT EXISTS supplements_def (id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT, dozaj TEXT);
+CREATE TABLE IF NOT EXISTS supplement_logs (id INTEGER PRIMARY KEY AUTOINCREMENT, sup_id INTEGER, tarih TEXT);
+CREATE TABLE IF NOT EXISTS shortcuts (id INTEGER PRIMARY KEY AUTOINCREMENT, name TEXT, url TEXT, icon TEXT, color_theme TEXT);
+
+CREATE TABLE IF NOT EXISTS workouts (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    bolge TEXT, hareket TEXT,
+    set_sayisi INTEGER DEFAULT 0, tekrar INTEGER DEFAULT 0, agirlik REAL DEFAULT 0,
+    sure INTEGER DEFAULT 0, mesafe REAL DEFAULT 0,
+    tarih TEXT
+);
+
+-- Varsayılanlar (sadece tablo boşsa)
+INSERT INTO supplements_def (name, dozaj)
+    SELECT * FROM (VALUES ('Creatine', '5g'), ('Whey Protein', '1 Ölçek'), ('Pre-Workout', '1 Ölçek'))
+    WHERE NOT EXISTS (SELECT 1 FROM supplements_def);
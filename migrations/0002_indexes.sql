@@ -0,0 +1,13 @@
+-- Sıcak sorgular için indeksler.
+-- id INTEGER PRIMARY KEY = rowid, her indeks girdisinin sonunda zaten var; bu yüzden (tarih) indeksi
+-- "ORDER BY tarih DESC, id DESC" sıralamasını da ek sıralama yapmadan karşılar.
+CREATE INDEX IF NOT EXISTS ix_workouts_tarih ON workouts (tarih);
+CREATE INDEX IF NOT EXISTS ix_workouts_bolge ON workouts (bolge);
+
+-- Aynı gün aynı takviye iki kez loglanmışsa (eski yarış durumu) tekini bırak
+DELETE FROM supplement_logs
+    WHERE id NOT IN (SELECT min(id) FROM supplement_logs GROUP BY sup_id, tarih);
+
+-- toggle_sup: tek satırlık DELETE / INSERT; 30 günlük sayım ve günün listesi: (tarih, sup_id) kapsayan indeks
+CREATE UNIQUE INDEX IF NOT EXISTS ux_supplement_logs_sup_tarih ON supplement_logs (sup_id, tarih);
+CREATE INDEX IF NOT EXISTS ix_supplement_logs_tarih ON supplement_logs (tarih, sup_id);
@@ -0,0 +1,94 @@
+-- /analysis için artımlı özet tablolar. Tetikleyiciler yazma ile aynı transaction'da günceller.
+-- hacim = set_sayisi * tekrar * agirlik (kardiyoda 0), sure/mesafe kardiyo toplamları.
+-- Anahtarlar coalesce(.., '') ile: WITHOUT ROWID birincil anahtarı NULL kabul etmez, eski satırlarda bolge/tarih boş olabilir.
+CREATE TABLE IF NOT EXISTS workout_daily (
+    tarih TEXT, bolge TEXT,
+    adet INTEGER NOT NULL DEFAULT 0, hacim REAL NOT NULL DEFAULT 0,
+    sure INTEGER NOT NULL DEFAULT 0, mesafe REAL NOT NULL DEFAULT 0,
+    PRIMARY KEY (tarih, bolge)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS workout_bolge_totals (
+    bolge TEXT PRIMARY KEY,
+    adet INTEGER NOT NULL DEFAULT 0, hacim REAL NOT NULL DEFAULT 0,
+    sure INTEGER NOT NULL DEFAULT 0, mesafe REAL NOT NULL DEFAULT 0
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS supplement_daily (
+    tarih TEXT PRIMARY KEY,
+    adet INTEGER NOT NULL DEFAULT 0
+) WITHOUT ROWID;
+
+-- --- workouts ---
+CREATE TRIGGER IF NOT EXISTS trg_workouts_rollup_ins AFTER INSERT ON workouts
+BEGIN
+    INSERT INTO workout_daily (tarih, bolge, adet, hacim, sure, mesafe)
+        VALUES (coalesce(NEW.tarih, ''), coalesce(NEW.bolge, ''), 1, ifnull(NEW.set_sayisi * NEW.tekrar * NEW.agirlik, 0), ifnull(NEW.sure + 0, 0), ifnull(NEW.mesafe + 0, 0))
+        ON CONFLICT (tarih, bolge) DO UPDATE SET
+            adet = adet + 1, hacim = hacim + excluded.hacim, sure = sure + excluded.sure, mesafe = mesafe + excluded.mesafe;
+    INSERT INTO workout_bolge_totals (bolge, adet, hacim, sure, mesafe)
+        VALUES (coalesce(NEW.bolge, ''), 1, ifnull(NEW.set_sayisi * NEW.tekrar * NEW.agirlik, 0), ifnull(NEW.sure + 0, 0), ifnull(NEW.mesafe + 0, 0))
+        ON CONFLICT (bolge) DO UPDATE SET
+            adet = adet + 1, hacim = hacim + excluded.hacim, sure = sure + excluded.sure, mesafe = mesafe + excluded.mesafe;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_workouts_rollup_del AFTER DELETE ON workouts
+BEGIN
+    UPDATE workout_daily SET adet = adet - 1,
+            hacim = hacim - ifnull(OLD.set_sayisi * OLD.tekrar * OLD.agirlik, 0),
+            sure = sure - ifnull(OLD.sure + 0, 0), mesafe = mesafe - ifnull(OLD.mesafe + 0, 0)
+        WHERE tarih IS coalesce(OLD.tarih, '') AND bolge IS coalesce(OLD.bolge, '');
+    DELETE FROM workout_daily WHERE tarih IS coalesce(OLD.tarih, '') AND bolge IS coalesce(OLD.bolge, '') AND adet <= 0;
+    UPDATE workout_bolge_totals SET adet = adet - 1,
+            hacim = hacim - ifnull(OLD.set_sayisi * OLD.tekrar * OLD.agirlik, 0),
+            sure = sure - ifnull(OLD.sure + 0, 0), mesafe = mesafe - ifnull(OLD.mesafe + 0, 0)
+        WHERE bolge IS coalesce(OLD.bolge, '');
+    DELETE FROM workout_bolge_totals WHERE bolge IS coalesce(OLD.bolge, '') AND adet <= 0;
+END;
+
+-- Düzenleme = eski satırı çıkar + yeni satırı ekle
+CREATE TRIGGER IF NOT EXISTS trg_workouts_rollup_upd AFTER UPDATE ON workouts
+BEGIN
+    UPDATE workout_daily SET adet = adet - 1,
+            hacim = hacim - ifnull(OLD.set_sayisi * OLD.tekrar * OLD.agirlik, 0),
+            sure = sure - ifnull(OLD.sure + 0, 0), mesafe = mesafe - ifnull(OLD.mesafe + 0, 0)
+        WHERE tarih IS coalesce(OLD.tarih, '') AND bolge IS coalesce(OLD.bolge, '');
+    DELETE FROM workout_daily WHERE tarih IS coalesce(OLD.tarih, '') AND bolge IS coalesce(OLD.bolge, '') AND adet <= 0;
+    UPDATE workout_bolge_totals SET adet = adet - 1,
+            hacim = hacim - ifnull(OLD.set_sayisi * OLD.tekrar * OLD.agirlik, 0),
+            sure = sure - ifnull(OLD.sure + 0, 0), mesafe = mesafe - ifnull(OLD.mesafe + 0, 0)
+        WHERE bolge IS coalesce(OLD.bolge, '');
+    DELETE FROM workout_bolge_totals WHERE bolge IS coalesce(OLD.bolge, '') AND adet <= 0;
+
+    INSERT INTO workout_daily (tarih, bolge, adet, hacim, sure, mesafe)
+        VALUES (coalesce(NEW.tarih, ''), coalesce(NEW.bolge, ''), 1, ifnull(NEW.set_sayisi * NEW.tekrar * NEW.agirlik, 0), ifnull(NEW.sure + 0, 0), ifnull(NEW.mesafe + 0, 0))
+        ON CONFLICT (tarih, bolge) DO UPDATE SET
+            adet = adet + 1, hacim = hacim + excluded.hacim, sure = sure + excluded.sure, mesafe = mesafe + excluded.mesafe;
+    INSERT INTO workout_bolge_totals (bolge, adet, hacim, sure, mesafe)
+        VALUES (coalesce(NEW.bolge, ''), 1, ifnull(NEW.set_sayisi * NEW.tekrar * NEW.agirlik, 0), ifnull(NEW.sure + 0, 0), ifnull(NEW.mesafe + 0, 0))
+        ON CONFLICT (bolge) DO UPDATE SET
+            adet = adet + 1, hacim = hacim + excluded.hacim, sure = sure + excluded.sure, mesafe = mesafe + excluded.mesafe;
+END;
+
+-- --- supplement_logs ---
+CREATE TRIGGER IF NOT EXISTS trg_supplement_logs_rollup_ins AFTER INSERT ON supplement_logs
+BEGIN
+    INSERT INTO supplement_daily (tarih, adet) VALUES (coalesce(NEW.tarih, ''), 1)
+        ON CONFLICT (tarih) DO UPDATE SET adet = adet + 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_supplement_logs_rollup_del AFTER DELETE ON supplement_logs
+BEGIN
+    UPDATE supplement_daily SET adet = adet - 1 WHERE tarih IS coalesce(OLD.tarih, '');
+    DELETE FROM supplement_daily WHERE tarih IS coalesce(OLD.tarih, '') AND adet <= 0;
+END;
+
+-- Mevcut geçmişten ilk doldurma
+INSERT INTO workout_daily (tarih, bolge, adet, hacim, sure, mesafe)
+    SELECT coalesce(tarih, ''), coalesce(bolge, ''), count(*), total(set_sayisi * tekrar * agirlik), total(sure), total(mesafe)
+    FROM workouts GROUP BY 1, 2;
+INSERT INTO workout_bolge_totals (bolge, adet, hacim, sure, mesafe)
+    SELECT coalesce(bolge, ''), count(*), total(set_sayisi * tekrar * agirlik), total(sure), total(mesafe)
+    FROM workouts GROUP BY 1;
+INSERT INTO supplement_daily (tarih, adet)
+    SELECT coalesce(tarih, ''), count(*) FROM supplement_logs GROUP BY 1;
@@ -0,0 +1,31 @@
+-- Yerel besin kataloğu (/api_search). Barkod (EAN) tekil indeksle, isim/marka FTS5 önek indeksiyle aranır.
+-- FTS5 external content tablosu tamsayı rowid istediği için barkod PRIMARY KEY değil, UNIQUE.
+CREATE TABLE IF NOT EXISTS foods (
+    id INTEGER PRIMARY KEY,
+    barcode TEXT UNIQUE,
+    name TEXT NOT NULL, brand TEXT,
+    cal REAL, pro REAL, fat REAL, carb REAL
+);
+
+CREATE VIRTUAL TABLE IF NOT EXISTS foods_fts USING fts5(
+    name, brand,
+    content='foods', content_rowid='id',
+    tokenize='unicode61 remove_diacritics 2',
+    prefix='2 3'
+);
+
+CREATE TRIGGER IF NOT EXISTS trg_foods_fts_ins AFTER INSERT ON foods
+BEGIN
+    INSERT INTO foods_fts (rowid, name, brand) VALUES (NEW.id, NEW.name, NEW.brand);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_foods_fts_del AFTER DELETE ON foods
+BEGIN
+    INSERT INTO foods_fts (foods_fts, rowid, name, brand) VALUES ('delete', OLD.id, OLD.name, OLD.brand);
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_foods_fts_upd AFTER UPDATE OF name, brand ON foods
+BEGIN
+    INSERT INTO foods_fts (foods_fts, rowid, name, brand) VALUES ('delete', OLD.id, OLD.name, OLD.brand);
+    INSERT INTO foods_fts (rowid, name, brand) VALUES (NEW.id, NEW.name, NEW.brand);
+END;
@@ -0,0 +1,67 @@
+-- Veri sürümü: kullanıcı tablolarındaki her yazma sayacı artırır (aynı transaction'da).
+-- ETag'ler ve sunucu tarafı render önbelleği bu sayıdan türetilir; DB'de durduğu için tüm worker'lar aynı sürümü görür.
+CREATE TABLE IF NOT EXISTS data_version (
+    id INTEGER PRIMARY KEY CHECK (id = 1),
+    version INTEGER NOT NULL
+);
+INSERT OR IGNORE INTO data_version (id, version) VALUES (1, 1);
+
+CREATE TRIGGER IF NOT EXISTS trg_workouts_version_ins AFTER INSERT ON workouts
+BEGIN
+    UPDATE data_version SET version = version + 1 WHERE id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_workouts_version_upd AFTER UPDATE ON workouts
+BEGIN
+    UPDATE data_version SET version = version + 1 WHERE id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_workouts_version_del AFTER DELETE ON workouts
+BEGIN
+    UPDATE data_version SET version = version + 1 WHERE id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_supplement_logs_version_ins AFTER INSERT ON supplement_logs
+BEGIN
+    UPDATE data_version SET version = version + 1 WHERE id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_supplement_logs_version_upd AFTER UPDATE ON supplement_logs
+BEGIN
+    UPDATE data_version SET version = version + 1 WHERE id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_supplement_logs_version_del AFTER DELETE ON supplement_logs
+BEGIN
+    UPDATE data_version SET version = version + 1 WHERE id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_supplements_def_version_ins AFTER INSERT ON supplements_def
+BEGIN
+    UPDATE data_version SET version = version + 1 WHERE id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_supplements_def_version_upd AFTER UPDATE ON supplements_def
+BEGIN
+    UPDATE data_version SET version = version + 1 WHERE id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_supplements_def_version_del AFTER DELETE ON supplements_def
+BEGIN
+    UPDATE data_version SET version = version + 1 WHERE id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_shortcuts_version_ins AFTER INSERT ON shortcuts
+BEGIN
+    UPDATE data_version SET version = version + 1 WHERE id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_shortcuts_version_upd AFTER UPDATE ON shortcuts
+BEGIN
+    UPDATE data_version SET version = version + 1 WHERE id = 1;
+END;
+
+CREATE TRIGGER IF NOT EXISTS trg_shortcuts_version_del AFTER DELETE ON shortcuts
+BEGIN
+    UPDATE data_version SET version = version + 1 WHERE id = 1;
+END;
@@ -0,0 +1,9 @@
+-- /api/sync idempotency anahtarları: istemcinin ürettiği anahtar ve ilk uygulamanın sonucu.
+-- Aynı anahtar tekrar gelirse mutasyon yeniden uygulanmaz, kayıtlı sonuç döner.
+CREATE TABLE IF NOT EXISTS sync_keys (
+    key TEXT PRIMARY KEY,
+    result TEXT NOT NULL,
+    created_at TEXT NOT NULL
+) WITHOUT ROWID;
+
+CREATE INDEX IF NOT EXISTS ix_sync_keys_created_at ON sync_keys (created_at);
@@ -0,0 +1,7 @@
+-- Barkodları foods.normalize_barcode ile aynı tek biçime çevirir: baştaki sıfırlar atılıp 13 haneye tamamlanır
+-- (UPC-A 12 hane, EAN-13 ve GTIN-14 aynı anahtar olur). Aynı ürün iki biçimde de varsa UNIQUE
+-- çakışan satır eski hâlinde kalır; arama ham biçimi de denediği için yine bulunur.
+UPDATE OR IGNORE foods
+    SET barcode = substr('0000000000000' || ltrim(barcode, '0'), -13)
+    WHERE length(ltrim(barcode, '0')) <= 13
+      AND barcode != substr('0000000000000' || ltrim(barcode, '0'), -13);
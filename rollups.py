@@ -0,0 +1,64 @@
+"""/analysis özet tabloları (migrations/0003_rollups.sql).
+
+Tabloları tetikleyiciler günceller; burada okuma, ham satırlardan yeniden hesaplama
+ve ham veri ile özetin tutarlılık kontrolü var.
+"""
+
+# Ham satırlardan beklenen özet: (tablo, anahtar kolonlar, kaynak sorgu)
+# Anahtarlar tetikleyicilerdeki gibi coalesce(.., ''): özet tablolarının birincil anahtarı NULL almaz.
+ROLLUPS = (
+    ('workout_daily', ('tarih', 'bolge'),
+     "SELECT coalesce(tarih, '') AS tarih, coalesce(bolge, '') AS bolge, count(*) AS adet, "
+     'total(set_sayisi * tekrar * agirlik) AS hacim, total(sure) AS sure, total(mesafe) AS mesafe '
+     'FROM workouts GROUP BY 1, 2'),
+    ('workout_bolge_totals', ('bolge',),
+     "SELECT coalesce(bolge, '') AS bolge, count(*) AS adet, total(set_sayisi * tekrar * agirlik) AS hacim, "
+     'total(sure) AS sure, total(mesafe) AS mesafe FROM workouts GROUP BY 1'),
+    ('supplement_daily', ('tarih',),
+     "SELECT coalesce(tarih, '') AS tarih, count(*) AS adet FROM supplement_logs GROUP BY 1"),
+)
+NO_BOLGE = 'Belirsiz'   # bolge'si boş kayıtların etiketi
+TOLERANCE = 1e-6  # REAL toplamlarında artımlı ekle/çıkar yuvarlama farkı
+
+
+def summary(conn):
+    """Analiz sayfasının ihtiyacı olan her şey; sadece birkaç satırlık tablolardan okur."""
+    rows = conn.execute('SELECT bolge, adet, hacim, sure, mesafe FROM workout_bolge_totals ORDER BY bolge').fetchall()
+    fav = max(rows, key=lambda r: r['adet'], default=None)
+    sup = conn.execute("SELECT total(adet) FROM supplement_daily WHERE tarih >= date('now', '-30 days')").fetchone()[0]
+    return {
+        'total': sum(r['adet'] for r in rows),
+        'fav': (fav['bolge'] or NO_BOLGE) if fav else None,
+        'sup': int(sup),
+        'labels': [r['bolge'] or NO_BOLGE for r in rows],
+        'data': [r['adet'] for r in rows],
+        'hacim': sum(r['hacim'] for r in rows),
+        'sure': sum(r['sure'] for r in rows),
+        'mesafe': sum(r['mesafe'] for r in rows),
+    }
+
+
+def rebuild(conn):
+    """Özetleri ham satırlardan sıfırdan hesaplar. db.write() içinde çağrılmalı.
+
+    Özet tablolarında sürüm tetikleyicisi yok; /analysis ETag'i ve render önbelleği eskimesin
+    diye veri sürümü aynı transaction'da elle artırılır.
+    """
+    for table, _, source in ROLLUPS:
+        conn.execute(f'DELETE FROM {table}')
+        conn.execute(f'INSERT INTO {table} {source}')
+    conn.execute('UPDATE data_version SET version = version + 1 WHERE id = 1')
+
+
+def check(conn):
+    """Özet ile ham veri arasındaki farkları (tablo, anahtar, beklenen, mevcut) listesi olarak döndürür."""
+    diffs = []
+    for table, keys, source in ROLLUPS:
+        expected = {tuple(r[k] for k in keys): dict(r) for r in conn.execute(source)}
+        actual = {tuple(r[k] for k in keys): dict(r) for r in conn.execute(f'SELECT * FROM {table}')}
+        for key in expected.keys() | actual.keys():
+            exp, act = expected.get(key), actual.get(key)
+            if exp is None or act is None or any(abs((exp[c] or 0) - (act[c] or 0)) > TOLERANCE
+                                                 for c in exp if c not in keys):
+                diffs.append((table, key, exp, act))
+    return diffs
@@ -0,0 +1,95 @@
+// Küçük SVG grafik yardımcısı: analiz sayfasının ihtiyacı kadar (halka ve çizgi; Chart.js yerine).
+const Charts = (() => {
+    const NS = 'http://www.w3.org/2000/svg';
+    const COLORS = ['#0A84FF', '#30D158', '#FF453A', '#BF5AF2', '#FF9F0A', '#64D2FF'];
+
+    function el(tag, attrs, parent) {
+        const node = document.createElementNS(NS, tag);
+        for (const k in attrs) node.setAttribute(k, attrs[k]);
+        if (parent) parent.appendChild(node);
+        return node;
+    }
+
+    function legend(target, labels, colors) {
+        const box = document.createElement('div');
+        box.style.cssText = 'display:flex;flex-wrap:wrap;justify-content:center;gap:6px 12px;margin-top:12px;font-size:12px;color:#8E8E93;';
+        labels.forEach((label, i) => {
+            const item = document.createElement('span');
+            item.innerHTML = `<i style="display:inline-block;width:10px;height:10px;border-radius:2px;margin-right:5px;background:${colors[i % colors.length]}"></i>`;
+            item.appendChild(document.createTextNode(label));
+            box.appendChild(item);
+        });
+        target.appendChild(box);
+    }
+
+    // Halka grafik; cutout iç boşluk oranı. Veri yoksa gri boş halka çizer.
+    function doughnut(target, labels, data, opts = {}) {
+        const colors = opts.colors || COLORS;
+        const cutout = opts.cutout ?? 0.7;
+        const total = data.reduce((a, b) => a + b, 0);
+        const svg = el('svg', { viewBox: '-1 -1 2 2', width: '100%', height: '100%', role: 'img' });
+        svg.style.transform = 'rotate(-90deg)';
+        const r = (1 + cutout) / 2, width = 1 - cutout, circ = 2 * Math.PI * r;
+        if (!total) {
+            el('circle', { r, fill: 'none', stroke: '#333', 'stroke-width': width }, svg);
+        } else {
+            let offset = 0;
+            data.forEach((value, i) => {
+                const len = value / total * circ;
+                const arc = el('circle', {
+                    r, fill: 'none', stroke: colors[i % colors.length], 'stroke-width': width,
+                    'stroke-dasharray': `${len} ${circ - len}`, 'stroke-dashoffset': -offset,
+                }, svg);
+                el('title', {}, arc).textContent = `${labels[i]}: ${value}`;
+                offset += len;
+            });
+        }
+        target.replaceChildren(svg);
+        if (total && opts.legend !== false) legend(target.parentNode, labels, colors);
+        return svg;
+    }
+
+    // Çizgi grafik. series: [{label, data, color?, markers?}] — markers: vurgulanacak noktalar (bool dizisi).
+    // labels x ekseni; sadece ilk ve son etiket yazılır. opts.unit y değerlerinin birimi.
+    function line(target, labels, series, opts = {}) {
+        const W = 320, H = opts.height || 160, P = { l: 34, r: 6, t: 8, b: 18 };
+        const values = series.flatMap(s => s.data).filter(v => v != null);
+        const svg = el('svg', { viewBox: `0 0 ${W} ${H}`, width: '100%', role: 'img' });
+        svg.style.cssText = 'display:block;font-size:9px;fill:#8E8E93;';
+        if (!values.length) {
+            el('text', { x: W / 2, y: H / 2, 'text-anchor': 'middle' }, svg).textContent = 'Veri yok';
+            target.replaceChildren(svg);
+            return svg;
+        }
+        let lo = Math.min(...values), hi = Math.max(...values);
+        if (lo === hi) { lo -= 1; hi += 1; }
+        const n = Math.max(labels.length - 1, 1);
+        const x = i => P.l + i / n * (W - P.l - P.r);
+        const y = v => P.t + (1 - (v - lo) / (hi - lo)) * (H - P.t - P.b);
+        const fmt = v => (Math.abs(v) >= 1000 ? Math.round(v / 100) / 10 + 'k' : Math.round(v * 10) / 10) + (opts.unit || '');
+        [lo, (lo + hi) / 2, hi].forEach(v => {
+            el('line', { x1: P.l, x2: W - P.r, y1: y(v), y2: y(v), stroke: 'rgba(255,255,255,0.08)' }, svg);
+            el('text', { x: P.l - 4, y: y(v) + 3, 'text-anchor': 'end' }, svg).textContent = fmt(v);
+        });
+        if (labels.length) {
+            el('text', { x: P.l, y: H - 4 }, svg).textContent = labels[0];
+            el('text', { x: W - P.r, y: H - 4, 'text-anchor': 'end' }, svg).textContent = labels[labels.length - 1];
+        }
+        series.forEach((s, si) => {
+            const color = s.color || COLORS[si % COLORS.length];
+            const pts = s.data.map((v, i) => v == null ? null : `${x(i).toFixed(1)},${y(v).toFixed(1)}`).filter(Boolean);
+            el('polyline', { points: pts.join(' '), fill: 'none', stroke: color, 'stroke-width': 1.5,
+                             'stroke-linejoin': 'round', 'stroke-linecap': 'round' }, svg);
+            (s.markers || []).forEach((on, i) => {
+                if (!on || s.data[i] == null) return;
+                const dot = el('circle', { cx: x(i), cy: y(s.data[i]), r: 3, fill: opts.markerColor || '#FF9F0A' }, svg);
+                el('title', {}, dot).textContent = `${labels[i]}: ${fmt(s.data[i])}`;
+            });
+        });
+        target.replaceChildren(svg);
+        if (series.length > 1) legend(target, series.map(s => s.label), series.map((s, i) => s.color || COLORS[i % COLORS.length]));
+        return svg;
+    }
+
+    return { doughnut, line, legend, COLORS };
+})();
@@ -0,0 +1,86 @@
+// Çevrimdışı mutasyon kuyruğu. Hem sayfa hem service worker (importScripts) kullanır.
+// Mutasyonlar IndexedDB'de bekler, /api/sync'e toplu (en fazla BATCH'lik paketlerle) gönderilir;
+// sonuçlar BroadcastChannel('lifeos-sync') ile açık sayfalara duyurulur.
+(function (global) {
+    const DB_NAME = 'lifeos-sync', STORE = 'queue';
+    const channel = new BroadcastChannel('lifeos-sync');
+
+    function openDb() {
+        return new Promise((resolve, reject) => {
+            const req = indexedDB.open(DB_NAME, 1);
+            req.onupgradeneeded = () => req.result.createObjectStore(STORE, { keyPath: 'seq', autoIncrement: true });
+            req.onsuccess = () => resolve(req.result);
+            req.onerror = () => reject(req.error);
+        });
+    }
+
+    function withStore(mode, fn) {
+        return openDb().then(db => new Promise((resolve, reject) => {
+            const tx = db.transaction(STORE, mode);
+            const req = fn(tx.objectStore(STORE));
+            tx.oncomplete = () => { db.close(); resolve(req && req.result); };
+            tx.onerror = () => { db.close(); reject(tx.error); };
+        }));
+    }
+
+    function newKey() {
+        if (global.crypto && crypto.randomUUID) return crypto.randomUUID();
+        return Date.now().toString(36) + '-' + Math.random().toString(36).slice(2);
+    }
+
+    function today() {
+        const d = new Date();
+        return d.getFullYear() + '-' + String(d.getMonth() + 1).padStart(2, '0') + '-' + String(d.getDate()).padStart(2, '0');
+    }
+
+    // Mutasyonu kuyruğa ekler; anahtarı ve tarihi (kaydedildiği an, gönderildiği an değil) burada alır
+    function enqueue(op, data) {
+        const m = { key: newKey(), op: op, data: data, tarih: today() };
+        return withStore('readwrite', s => { s.add(m); }).then(() => m);
+    }
+
+    function pending() {
+        return withStore('readonly', s => s.getAll());
+    }
+
+    function drop(seqs) {
+        return withStore('readwrite', s => { seqs.forEach(seq => s.delete(seq)); });
+    }
+
+    const BATCH = 500;   // sunucudaki SYNC_MAX_BATCH
+
+    // Tek paket gönderir; sadece sunucunun sonuç döndürdüğü mutasyonlar kuyruktan silinir.
+    // Paket düzeyinde hata (400 dahil) atılır ve kuyruk olduğu gibi kalır, sonra tekrar denenir.
+    function send(items) {
+        const body = { mutations: items.map(m => ({ key: m.key, op: m.op, data: m.data, tarih: m.tarih })) };
+        return fetch('/api/sync', {
+            method: 'POST', credentials: 'same-origin',
+            headers: { 'Content-Type': 'application/json', 'Accept': 'application/json' },
+            body: JSON.stringify(body)
+        }).then(res => {
+            if (!res.ok) throw new Error('HTTP ' + res.status);
+            return res.json();
+        }).then(r => {
+            const done = new Set(r.results.map(x => x.key));
+            return drop(items.filter(m => done.has(m.key)).map(m => m.seq)).then(() => {
+                channel.postMessage(r.results);
+                return r.results;
+            });
+        });
+    }
+
+    let inFlight = null;
+    function flush() {
+        if (inFlight) return inFlight;
+        // Uzun çevrimdışı dönemde biriken kuyruk BATCH'lik paketlerle, sırayla gider
+        inFlight = pending().then(items => {
+            const results = [];
+            const next = i => i >= items.length ? results
+                : send(items.slice(i, i + BATCH)).then(r => { results.push(...r); return next(i + BATCH); });
+            return next(0);
+        }).finally(() => { inFlight = null; });
+        return inFlight;
+    }
+
+    global.LifeSync = { enqueue: enqueue, flush: flush, pending: pending, channel: 'lifeos-sync' };
+})(self);
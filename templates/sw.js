@@ -0,0 +1,54 @@
+// Service worker: mutasyon kuyruğunu arka planda boşaltır, sayfaları çevrimdışı için saklar.
+// app.py /sw.js rotası render eder; asset adları static/dist/manifest.json'dan gelir.
+importScripts({{ asset_url('js/sync.js') | tojson }});
+
+const PAGE_CACHE = 'lifeos-pages-v1';
+const ASSET_CACHE = 'lifeos-assets-v1';
+const ASSETS = {{ assets | tojson }};
+
+// Parmak izli dosyalar değişmez: kurulumda indir, eskileri (manifestte olmayanları) aktivasyonda sil
+self.addEventListener('install', event => {
+    event.waitUntil(caches.open(ASSET_CACHE).then(cache => cache.addAll(ASSETS)).catch(() => {}));
+    self.skipWaiting();
+});
+self.addEventListener('activate', event => event.waitUntil(
+    caches.open(ASSET_CACHE)
+        .then(cache => cache.keys().then(keys => Promise.all(
+            keys.filter(req => !ASSETS.includes(new URL(req.url).pathname)).map(req => cache.delete(req)))))
+        .then(() => self.clients.claim())
+));
+
+// Background Sync (destekleyen tarayıcılarda): bağlantı gelince kuyruğu gönder
+self.addEventListener('sync', event => {
+    if (event.tag === 'lifeos-sync') event.waitUntil(LifeSync.flush());
+});
+
+self.addEventListener('message', event => {
+    if (event.data === 'flush') event.waitUntil(LifeSync.flush().catch(() => {}));
+});
+
+// Parmak izli dosyalar: önce önbellek. Sayfalar: önce ağ, olmazsa son kaydedilen kopya
+self.addEventListener('fetch', event => {
+    const req = event.request;
+    if (req.method !== 'GET') return;
+    if (new URL(req.url).pathname.startsWith('/static/dist/')) {
+        event.respondWith(caches.match(req).then(hit => hit || fetch(req).then(res => {
+            if (res.ok) {
+                const copy = res.clone();
+                caches.open(ASSET_CACHE).then(cache => cache.put(req, copy));
+            }
+            return res;
+        })));
+        return;
+    }
+    if (req.mode !== 'navigate') return;
+    event.respondWith(
+        fetch(req).then(res => {
+            if (res.ok) {
+                const copy = res.clone();
+                caches.open(PAGE_CACHE).then(cache => cache.put(req, copy));
+            }
+            return res;
+        }).catch(() => caches.match(req))
+    );
+});